@@ -8,7 +8,7 @@ from sqlalchemy import pool
 # Add the backend directory to the sys path to import modules
 sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '..')))
 
-from database.models import Base
+from database.models import Base, TRANSACTION_SEARCH_TABLE, TRANSACTION_SEARCH_INDEX
 from database.session import SQLALCHEMY_DATABASE_URL
 from alembic import context
 
@@ -27,6 +27,18 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Leaves the full-text search objects, which are created with raw DDL
+    rather than from the models, out of autogenerate.
+    """
+    if type_ == "table" and name.startswith(TRANSACTION_SEARCH_TABLE):
+        return False
+    if type_ == "index" and name == TRANSACTION_SEARCH_INDEX:
+        return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -51,6 +63,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -74,7 +87,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
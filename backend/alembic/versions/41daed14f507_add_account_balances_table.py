@@ -0,0 +1,36 @@
+"""Add account_balances table
+
+Revision ID: 41daed14f507
+Revises: 61d2ae9d3af0
+Create Date: 2026-10-17 09:12:40.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '41daed14f507'
+down_revision: Union[str, Sequence[str], None] = '61d2ae9d3af0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('account_balances',
+    sa.Column('account_name', sa.String(), nullable=False),
+    sa.Column('balance', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('account_name')
+    )
+
+    # The table is populated from the ledger by the application on startup
+    # (crud.rebuild_account_balances), since the transactions table is
+    # created outside of these migrations.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('account_balances')
@@ -0,0 +1,40 @@
+"""Add monthly_category_totals table
+
+Revision ID: 4479d7b9a725
+Revises: fef93e01722c
+Create Date: 2026-10-17 13:26:51.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4479d7b9a725'
+down_revision: Union[str, Sequence[str], None] = 'fef93e01722c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('monthly_category_totals',
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('year_month', sa.String(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('account', sa.String(), nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('type', 'year_month', 'category', 'account')
+    )
+
+    # The table is populated from the ledger by the application on startup
+    # (crud.rebuild_monthly_totals), since the transactions table is
+    # created outside of these migrations.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('monthly_category_totals')
@@ -0,0 +1,70 @@
+"""Store money as integer minor units
+
+Revision ID: 7b3f9e2c8d41
+Revises: c5e0a1d7b2f4
+Create Date: 2026-10-17 17:05:12.630841
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3f9e2c8d41'
+down_revision: Union[str, Sequence[str], None] = 'c5e0a1d7b2f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Matches models.MINOR_UNITS
+MINOR_UNITS = 100
+
+MONEY_COLUMNS = [
+    ('transactions', 'amount'),
+    ('budgets', 'amount'),
+    ('recurring_transactions', 'amount'),
+    ('net_worth_history', 'value'),
+    ('account_balances', 'balance'),
+    ('net_worth_total', 'value'),
+    ('monthly_category_totals', 'total'),
+]
+
+
+def _columns_of_type(type_class):
+    """Returns the money columns whose current type is an instance of type_class."""
+    inspector = sa.inspect(op.get_bind())
+    columns = []
+    for table, column in MONEY_COLUMNS:
+        if not inspector.has_table(table):
+            continue
+        existing = {c['name']: c['type'] for c in inspector.get_columns(table)}
+        if isinstance(existing.get(column), type_class):
+            columns.append((table, column))
+    return columns
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Tables created by the application from the current models already
+    # store integers and are left alone
+    for table, column in _columns_of_type(sa.Float):
+        if op.get_bind().dialect.name == 'postgresql':
+            op.alter_column(table, column, type_=sa.BigInteger(), existing_type=sa.Float(), existing_nullable=False,
+                            postgresql_using=f'ROUND({column} * {MINOR_UNITS})::bigint')
+        else:
+            op.execute(f'UPDATE {table} SET {column} = CAST(ROUND({column} * {MINOR_UNITS}) AS INTEGER)')
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.alter_column(column, type_=sa.BigInteger(), existing_type=sa.Float(), existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column in _columns_of_type(sa.Integer):
+        if op.get_bind().dialect.name == 'postgresql':
+            op.alter_column(table, column, type_=sa.Float(), existing_type=sa.BigInteger(), existing_nullable=False,
+                            postgresql_using=f'{column}::double precision / {MINOR_UNITS}')
+        else:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.alter_column(column, type_=sa.Float(), existing_type=sa.BigInteger(), existing_nullable=False)
+            op.execute(f'UPDATE {table} SET {column} = CAST({column} AS REAL) / {MINOR_UNITS}')
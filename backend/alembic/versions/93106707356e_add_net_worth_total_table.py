@@ -0,0 +1,36 @@
+"""Add net_worth_total table
+
+Revision ID: 93106707356e
+Revises: 4479d7b9a725
+Create Date: 2026-10-17 15:02:11.417306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '93106707356e'
+down_revision: Union[str, Sequence[str], None] = '4479d7b9a725'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('net_worth_total',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('value', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    # The running total is populated from the ledger by the application on
+    # startup (crud.rebuild_account_balances), since the transactions table
+    # is created outside of these migrations.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('net_worth_total')
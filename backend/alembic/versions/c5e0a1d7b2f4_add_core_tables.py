@@ -0,0 +1,69 @@
+"""Add core tables
+
+Revision ID: c5e0a1d7b2f4
+Revises: 93106707356e
+Create Date: 2026-10-17 16:20:45.118032
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e0a1d7b2f4'
+down_revision: Union[str, Sequence[str], None] = '93106707356e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # These tables used to be created only by the application (create_all),
+    # so existing databases already have them
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table('accounts'):
+        op.create_table('accounts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_accounts_id'), 'accounts', ['id'], unique=False)
+        op.create_index(op.f('ix_accounts_name'), 'accounts', ['name'], unique=True)
+
+    if not inspector.has_table('categories'):
+        op.create_table('categories',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('type', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_categories_id'), 'categories', ['id'], unique=False)
+        op.create_index(op.f('ix_categories_name'), 'categories', ['name'], unique=True)
+
+    if not inspector.has_table('transactions'):
+        op.create_table('transactions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('type', sa.String(), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('from_account', sa.String(), nullable=True),
+        sa.Column('to_account', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_transactions_id'), 'transactions', ['id'], unique=False)
+        op.create_index('ix_transactions_date', 'transactions', ['date'], unique=False)
+        op.create_index('ix_transactions_type_date', 'transactions', ['type', 'date'], unique=False)
+        op.create_index('ix_transactions_category_type_date', 'transactions', ['category', 'type', 'date'], unique=False)
+        op.create_index('ix_transactions_from_account_amount', 'transactions', ['from_account', 'amount'], unique=False)
+        op.create_index('ix_transactions_to_account_amount', 'transactions', ['to_account', 'amount'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The tables may predate this revision, so they are left in place
+    pass
@@ -0,0 +1,160 @@
+"""Reference accounts and categories by id
+
+Revision ID: e4a8c1f07d35
+Revises: 7b3f9e2c8d41
+Create Date: 2026-10-17 18:12:37.402518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a8c1f07d35'
+down_revision: Union[str, Sequence[str], None] = '7b3f9e2c8d41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, name column, id column, referenced table)
+REFERENCES = [
+    ('transactions', 'category', 'category_id', 'categories'),
+    ('transactions', 'from_account', 'from_account_id', 'accounts'),
+    ('transactions', 'to_account', 'to_account_id', 'accounts'),
+    ('recurring_transactions', 'category', 'category_id', 'categories'),
+    ('recurring_transactions', 'from_account', 'from_account_id', 'accounts'),
+    ('recurring_transactions', 'to_account', 'to_account_id', 'accounts'),
+    ('budgets', 'category_name', 'category_id', 'categories'),
+]
+
+NOT_NULL = {'category', 'category_name', 'category_id'}
+
+# Transaction indexes whose name columns become id columns
+INDEXES = [
+    ('ix_transactions_category_type_date', ['category', 'type', 'date'], ['category_id', 'type', 'date']),
+    ('ix_transactions_from_account_amount', ['from_account', 'amount'], ['from_account_id', 'amount']),
+    ('ix_transactions_to_account_amount', ['to_account', 'amount'], ['to_account_id', 'amount']),
+]
+
+
+def _fk_name(table, column):
+    return f'fk_{table}_{column}'
+
+
+def _references_of(table):
+    return [ref for ref in REFERENCES if ref[0] == table]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Names that were typed into a transaction, rule or budget without
+    # existing in the accounts or categories tables get a row of their own
+    op.execute("""
+        INSERT INTO categories (name, type)
+        SELECT category, MIN(type) FROM (
+            SELECT category, type FROM transactions
+            UNION ALL SELECT category, type FROM recurring_transactions
+            UNION ALL SELECT category_name, 'Expense' FROM budgets
+        ) AS used
+        WHERE category NOT IN (SELECT name FROM categories)
+        GROUP BY category
+    """)
+    op.execute("""
+        INSERT INTO accounts (name)
+        SELECT DISTINCT name FROM (
+            SELECT from_account AS name FROM transactions
+            UNION SELECT to_account FROM transactions
+            UNION SELECT from_account FROM recurring_transactions
+            UNION SELECT to_account FROM recurring_transactions
+        ) AS used
+        WHERE name IS NOT NULL AND name NOT IN (SELECT name FROM accounts)
+    """)
+
+    for table, name_column, id_column, referenced in REFERENCES:
+        op.add_column(table, sa.Column(id_column, sa.Integer(), nullable=True))
+        op.execute(f"""
+            UPDATE {table} SET {id_column} = (
+                SELECT id FROM {referenced} WHERE {referenced}.name = {table}.{name_column}
+            )
+        """)
+
+    for index_name, _, _ in INDEXES:
+        op.drop_index(index_name, table_name='transactions')
+
+    for table in ('transactions', 'recurring_transactions', 'budgets'):
+        with op.batch_alter_table(table) as batch_op:
+            for _, name_column, id_column, referenced in _references_of(table):
+                batch_op.drop_column(name_column)
+                batch_op.alter_column(id_column, existing_type=sa.Integer(), nullable=id_column not in NOT_NULL)
+                batch_op.create_foreign_key(_fk_name(table, id_column), referenced, [id_column], ['id'])
+            if table == 'budgets':
+                batch_op.create_unique_constraint('uq_budgets_category_id', ['category_id'])
+
+    for index_name, _, columns in INDEXES:
+        op.create_index(index_name, 'transactions', columns, unique=False)
+
+    # The derived tables are keyed by id now. They are recreated empty and
+    # rebuilt from the ledger by the application on startup.
+    op.drop_table('account_balances')
+    op.create_table('account_balances',
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('balance', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], name=_fk_name('account_balances', 'account_id')),
+    sa.PrimaryKeyConstraint('account_id')
+    )
+    op.drop_table('monthly_category_totals')
+    op.create_table('monthly_category_totals',
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('year_month', sa.String(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.BigInteger(), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('type', 'year_month', 'category_id', 'account_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('monthly_category_totals')
+    op.create_table('monthly_category_totals',
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('year_month', sa.String(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('account', sa.String(), nullable=False),
+    sa.Column('total', sa.BigInteger(), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('type', 'year_month', 'category', 'account')
+    )
+    op.drop_table('account_balances')
+    op.create_table('account_balances',
+    sa.Column('account_name', sa.String(), nullable=False),
+    sa.Column('balance', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('account_name')
+    )
+
+    for index_name, _, _ in INDEXES:
+        op.drop_index(index_name, table_name='transactions')
+
+    for table, name_column, id_column, referenced in REFERENCES:
+        op.add_column(table, sa.Column(name_column, sa.String(), nullable=True))
+        op.execute(f"""
+            UPDATE {table} SET {name_column} = (
+                SELECT name FROM {referenced} WHERE {referenced}.id = {table}.{id_column}
+            )
+        """)
+
+    for table in ('transactions', 'recurring_transactions', 'budgets'):
+        with op.batch_alter_table(table) as batch_op:
+            if table == 'budgets':
+                batch_op.drop_constraint('uq_budgets_category_id', type_='unique')
+            for _, name_column, id_column, _ in _references_of(table):
+                batch_op.drop_constraint(_fk_name(table, id_column), type_='foreignkey')
+                batch_op.drop_column(id_column)
+                batch_op.alter_column(name_column, existing_type=sa.String(), nullable=name_column not in NOT_NULL)
+            if table == 'budgets':
+                batch_op.create_unique_constraint('budgets_category_name_key', ['category_name'])
+
+    for index_name, columns, _ in INDEXES:
+        op.create_index(index_name, 'transactions', columns, unique=False)
@@ -0,0 +1,58 @@
+"""Add composite indexes to transactions table
+
+Revision ID: fef93e01722c
+Revises: 41daed14f507
+Create Date: 2026-10-17 10:03:18.274519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fef93e01722c'
+down_revision: Union[str, Sequence[str], None] = '41daed14f507'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    'ix_transactions_date': ['date'],
+    'ix_transactions_type_date': ['type', 'date'],
+    'ix_transactions_category_type_date': ['category', 'type', 'date'],
+    'ix_transactions_from_account_amount': ['from_account', 'amount'],
+    'ix_transactions_to_account_amount': ['to_account', 'amount'],
+}
+
+
+def _existing_indexes():
+    """Returns the index names on transactions, or None if the table does not exist yet."""
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('transactions'):
+        return None
+    return {index['name'] for index in inspector.get_indexes('transactions')}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The transactions table is created by the application (create_all),
+    # which also creates these indexes on a fresh database.
+    existing = _existing_indexes()
+    if existing is None:
+        return
+
+    for name, columns in INDEXES.items():
+        if name not in existing:
+            op.create_index(name, 'transactions', columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    existing = _existing_indexes()
+    if existing is None:
+        return
+
+    for name in INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name='transactions')
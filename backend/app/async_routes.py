@@ -0,0 +1,80 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Dict
+from datetime import date
+
+from database import async_crud, crud
+from database.async_session import AsyncSessionLocal
+from . import schemas
+
+# Async versions of the hot read endpoints. When FINANCIAL_TRACKER_ASYNC_DB
+# is enabled this router is registered ahead of the sync handlers in
+# main.py, so it serves these paths; the responses are identical.
+router = APIRouter(include_in_schema=False)
+
+async def get_async_db():
+    """
+    FastAPI dependency to get an async DB session for each request.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+@router.get("/transactions/", response_model=schemas.TransactionPage)
+async def read_transactions(
+    skip: int = 0,
+    limit: int = Query(default=10, le=1000),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_count: bool = True,
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await async_crud.get_transactions(
+            db, skip=skip, limit=limit, start_date=start_date, end_date=end_date, type=type,
+            cursor=cursor, include_count=include_count,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/transactions/summary", response_model=schemas.Summary)
+async def read_summary(
+    group_by: str = "month",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    type: Optional[List[str]] = Query(default=None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await async_crud.get_summary(
+            db, group_by=crud.split_group_by(group_by), start_date=start_date, end_date=end_date, types=type,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/transactions/summary/by-category", response_model=Dict[str, float])
+async def read_summary_by_category(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    type: str = "Expense",
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await async_crud.get_summary_by_category(db, start_date=start_date, end_date=end_date, type=type)
+
+@router.get("/transactions/summary/by-month", response_model=Dict[str, float])
+async def read_summary_by_month(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    type: str = "Expense",
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await async_crud.get_summary_by_month(db, start_date=start_date, end_date=end_date, type=type)
+
+@router.get("/accounts/balances", response_model=Dict[str, float])
+async def read_account_balances(db: AsyncSession = Depends(get_async_db)):
+    return await async_crud.get_account_balances(db)
+
+@router.get("/budgets/status", response_model=List[schemas.BudgetStatus])
+async def read_budgets_status(db: AsyncSession = Depends(get_async_db)):
+    return await async_crud.get_budgets_status(db)
@@ -1,57 +1,213 @@
-from fastapi import FastAPI, Depends, HTTPException, Query
+import time as timer
+
+# Measured from here, so it covers importing FastAPI, SQLAlchemy and the app modules
+IMPORTS_STARTED = timer.perf_counter()
+
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from contextlib import asynccontextmanager
+from fastapi.responses import FileResponse, StreamingResponse
+from contextlib import asynccontextmanager, contextmanager
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict
-from datetime import date
+from datetime import date, datetime, time, timezone
+import csv
+import hashlib
+import io
+import json
 import os
 
 from database import models, crud
+from database.cache import transaction_count_cache, data_versions, response_cache, reference_data
 from database.session import SessionLocal, engine
+from database.async_session import ASYNC_DB_ENABLED, async_engine
+from database.analytics import analytics_engine
 from . import schemas
+from .scheduler import Scheduler
+
+# Set to false once the schema is managed with `alembic upgrade head`, to skip
+# checking every table on startup
+CREATE_TABLES_ON_STARTUP = os.environ.get("FINANCIAL_TRACKER_CREATE_TABLES", "true").lower() in ("1", "true", "yes")
 
-# Tells SQLAlchemy to create all tables defined in models
-models.Base.metadata.create_all(bind=engine)
+DEFAULT_ACCOUNTS = ["Bank Account", "Cash", "Touch and Go E-wallet"]
+DEFAULT_CATEGORIES = [("Initial Balance", "Income")]
+
+# Milliseconds spent in each startup phase, reported by /stats/startup
+startup_timings = {}
+
+@contextmanager
+def _timed(phase: str):
+    started = timer.perf_counter()
+    try:
+        yield
+    finally:
+        startup_timings[phase] = round((timer.perf_counter() - started) * 1000, 1)
+
+# Summaries and budget status come from the columnar analytics engine when
+# FINANCIAL_TRACKER_ANALYTICS is enabled, and from SQL otherwise
+reports = analytics_engine or crud
+
+# --- Scheduled Jobs ---
+def process_recurring_transactions_job():
+    db = SessionLocal()
+    try:
+        return crud.process_recurring_transactions(db)
+    finally:
+        db.close()
+
+def net_worth_snapshot_job():
+    db = SessionLocal()
+    try:
+        # Fill in the days since the history was last written, or build it
+        # from the whole ledger the first time
+        latest_snapshot = db.query(func.max(models.NetWorthHistory.date)).scalar()
+        crud.rebuild_net_worth_history(db, since=latest_snapshot.date() if latest_snapshot else None)
+        crud.record_net_worth_snapshot(db)
+    finally:
+        db.close()
+
+# Jobs run in the order they are added, so snapshots include new recurring transactions
+scheduler = Scheduler(daily_at=time.fromisoformat(os.environ.get("FINANCIAL_TRACKER_DAILY_JOBS_AT", "00:05")))
+scheduler.add_job("recurring_transactions", process_recurring_transactions_job)
+scheduler.add_job("net_worth_snapshot", net_worth_snapshot_job)
 
 # Lifespan Function
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup logic
+    startup_timings["imports"] = round((IMPORTS_FINISHED - IMPORTS_STARTED) * 1000, 1)
     print("Application startup: Seeding database...")
+
+    with _timed("connect"):
+        with engine.connect():
+            pass
+
+    if CREATE_TABLES_ON_STARTUP:
+        with _timed("create_tables"):
+            # Tells SQLAlchemy to create all tables defined in models
+            models.Base.metadata.create_all(bind=engine)
+
     db = SessionLocal()
     try:
-        # Check for default accounts
-        default_accounts = ["Bank Account", "Cash", "Touch and Go E-wallet"]
-        for acc_name in default_accounts:
-            account_exists = db.query(models.Account).filter(models.Account.name == acc_name).first()
-            if not account_exists:
-                crud.create_account(db, schemas.AccountCreate(name=acc_name))
-
-        # Check for initial balance category
-        initial_balance_category_exists = db.query(models.Category).filter(models.Category.name == "Initial Balance").first()
-        if not initial_balance_category_exists:
-            crud.create_category(db, schemas.CategoryCreate(name="Initial Balance", type="Income"))
-
-        # Process any due recurring transactions first
-        crud.process_recurring_transactions(db)
-
-        # Record net worth snapshot on every startup
-        crud.record_net_worth_snapshot(db)
-
-        print("Database seeding, recurring transactions, and net worth snapshot complete.")
+        with _timed("seeding"):
+            crud.seed_reference_data(db, DEFAULT_ACCOUNTS, DEFAULT_CATEGORIES)
+
+        with _timed("derived_tables"):
+            # Populate the tables derived from the ledger if they have never been built
+            if db.query(models.AccountBalance).first() is None or db.get(models.NetWorthTotal, crud.NET_WORTH_TOTAL_ID) is None:
+                crud.rebuild_account_balances(db)
+            if db.query(models.MonthlyCategoryTotal).first() is None:
+                crud.rebuild_monthly_totals(db)
     finally:
         db.close()
 
+    # Recurring transactions and net worth snapshots run in the background,
+    # right away and then daily, so the app accepts requests immediately
+    with _timed("jobs"):
+        scheduler.start()
+
+    print(f"Database seeding complete. Startup timings (ms): {startup_timings}")
+
     yield
 
     # Shutdown logic
+    await scheduler.stop()
+    if async_engine is not None:
+        await async_engine.dispose()
     print("Application shutdown.")
 
 # Create the FastAPI app instance
 app = FastAPI(lifespan=lifespan)
 
+# Async hot read endpoints take precedence over the sync ones when enabled
+if ASYNC_DB_ENABLED:
+    from .async_routes import router as async_router
+    app.include_router(async_router)
+
+# --- Conditional GETs ---
+# Read endpoints and the tables their responses are built from. Responses
+# carry an ETag, and clients sending it back in If-None-Match get a 304.
+# By default the ETag is a hash of the response body, so it is right even
+# when other processes write to the database. When the response cache is
+# enabled, it is derived from the tables' data versions instead, and
+# matching requests are answered without the database being queried. The
+# versions are per process, so only enable the cache when this process
+# makes every write.
+# Endpoints marked per_day also depend on the current month.
+VERSIONED_ENDPOINTS = {
+    "/transactions/": (("transactions",), False),
+    "/transactions/search": (("transactions",), False),
+    "/transactions/summary": (("transactions",), False),
+    "/transactions/summary/by-category": (("transactions",), False),
+    "/transactions/summary/by-month": (("transactions",), False),
+    "/categories/": (("categories",), False),
+    "/accounts/": (("accounts",), False),
+    "/reference-data": (("accounts", "categories"), False),
+    "/accounts/balances": (("transactions", "accounts"), False),
+    "/net-worth/history": (("net_worth_history",), False),
+    "/recurring-transactions/": (("recurring_transactions",), False),
+    "/budgets/": (("budgets",), False),
+    "/budgets/status": (("transactions", "budgets"), True),
+    "/dashboard": (("transactions", "accounts", "budgets", "net_worth_history"), True),
+}
+
+@app.middleware("http")
+async def conditional_get(request: Request, call_next):
+    endpoint = VERSIONED_ENDPOINTS.get(request.url.path)
+    if request.method != "GET" or endpoint is None:
+        return await call_next(request)
+
+    if not response_cache.enabled:
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=_cache_headers(etag))
+        headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+        headers.update(_cache_headers(etag))
+        return Response(content=body, media_type=response.headers.get("content-type"), headers=headers)
+
+    tables, per_day = endpoint
+    today = datetime.now(timezone.utc).date().isoformat() if per_day else ""
+    etag = data_versions.etag(*tables, extra=today)
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=_cache_headers(etag))
+
+    # The version is read before the handler runs, so a cached body is never
+    # older than the version it is stored under
+    cache_key = (request.url.path, request.url.query, etag)
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        body, media_type = cached
+        return Response(content=body, media_type=media_type, headers=_cache_headers(etag))
+
+    response = await call_next(request)
+    if response.status_code != 200:
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    media_type = response.headers.get("content-type")
+    response_cache.put(cache_key, body, media_type)
+    headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+    headers.update(_cache_headers(etag))
+    return Response(content=body, media_type=media_type, headers=headers)
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates or "*" in candidates
+
+def _cache_headers(etag: str):
+    # no-cache lets browsers keep the response but revalidate it every time
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
 # --- CORS Configuration ---
 # This is crucial for allowing Vue.js frontend
 # to communicate with this backend
@@ -91,6 +247,43 @@ def create_new_transaction(transaction: schemas.TransactionCreate, db: Session =
     """
     return crud.create_transaction(db=db, transaction=transaction)
 
+@app.post("/transactions/bulk", response_model=schemas.BulkImportResult)
+async def bulk_import_transactions(
+    request: Request,
+    batch_size: int = Query(default=500, ge=1, le=10000),
+    db: Session = Depends(get_db),
+):
+    """
+    API endpoint to import many transactions at once, either as a JSON array
+    of transactions or as a CSV upload (multipart field "file", or a raw
+    text/csv body) with the same columns as the export. Valid rows are
+    inserted in batches and committed together; invalid rows are reported.
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("application/json"):
+        rows = await request.json()
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=422, detail="Expected a JSON array of transactions")
+    elif content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if not isinstance(upload, UploadFile):
+            raise HTTPException(status_code=422, detail="Expected a CSV file in the 'file' field")
+        rows = _iter_csv_rows(io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline=""))
+    elif content_type.startswith("text/csv"):
+        body = await request.body()
+        rows = _iter_csv_rows(io.StringIO(body.decode("utf-8-sig"), newline=""))
+    else:
+        raise HTTPException(status_code=415, detail="Send a JSON array or a CSV file")
+
+    # The CSV rows are read lazily while inserting, off the event loop
+    return await run_in_threadpool(crud.bulk_create_transactions, db, rows, batch_size)
+
+def _iter_csv_rows(text_file):
+    for row in csv.DictReader(text_file):
+        # Empty CSV cells mean "not set"
+        yield {key: value if value != "" else None for key, value in row.items()}
+
 @app.get("/transactions/", response_model=schemas.TransactionPage)
 def read_transactions(
     skip: int = 0,
@@ -98,13 +291,131 @@ def read_transactions(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_count: bool = True,
     db: Session = Depends(get_db),
 ):
-    transaction_page = crud.get_transactions(
-        db, skip=skip, limit=limit, start_date=start_date, end_date=end_date, type=type
-    )
+    """
+    API endpoint to list transactions. Pass the next_cursor of the previous
+    page as cursor (instead of skip) for constant-cost paging, and
+    include_count=false to skip counting the filtered rows.
+    """
+    try:
+        transaction_page = crud.get_transactions(
+            db, skip=skip, limit=limit, start_date=start_date, end_date=end_date, type=type,
+            cursor=cursor, include_count=include_count,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return transaction_page
 
+@app.get("/transactions/search", response_model=schemas.TransactionPage)
+def search_transactions(
+    q: str = Query(min_length=1),
+    limit: int = Query(default=10, le=1000),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    API endpoint to search transaction descriptions. Every word of q must
+    match, and a word ending in * matches as a prefix. Results come best
+    match first; pass the next_cursor of the previous page as cursor.
+    """
+    try:
+        return crud.search_transactions(
+            db, q=q, limit=limit, start_date=start_date, end_date=end_date, type=type, cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+EXPORT_COLUMNS = ["date", "type", "description", "category", "amount", "from_account", "to_account"]
+EXPORT_CHUNK_SIZE = 1000
+
+@app.get("/transactions/export")
+def export_transactions(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    type: Optional[str] = None,
+    format: str = Query(default="csv", pattern="^(csv|ndjson)$"),
+):
+    """
+    API endpoint to download every transaction matching the filters as CSV or
+    NDJSON. Rows are streamed from the database in chunks, so the export runs
+    in constant memory regardless of its size.
+    """
+    def generate():
+        # The session has to outlive the request handler, so the generator owns it
+        db = SessionLocal()
+        try:
+            rows = crud.iter_transactions(
+                db, start_date=start_date, end_date=end_date, type=type, chunk_size=EXPORT_CHUNK_SIZE
+            )
+            if format == "csv":
+                yield from _iter_csv(rows)
+            else:
+                yield from _iter_ndjson(rows)
+        finally:
+            db.close()
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"transactions-{start_date or 'all'}-to-{end_date or 'all'}.{format}"
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+def _export_record(row):
+    record = {column: getattr(row, column) for column in EXPORT_COLUMNS}
+    record["date"] = record["date"].isoformat() if record["date"] else None
+    return record
+
+def _iter_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    for i, row in enumerate(rows, start=1):
+        writer.writerow(_export_record(row))
+        # Hand the buffer over once per chunk rather than once per row
+        if i % EXPORT_CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def _iter_ndjson(rows):
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(_export_record(row)))
+        if len(lines) == EXPORT_CHUNK_SIZE:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+@app.get("/transactions/summary", response_model=schemas.Summary)
+def read_summary(
+    group_by: str = "month",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    type: Optional[List[str]] = Query(default=None),
+    db: Session = Depends(get_db),
+):
+    """
+    API endpoint to total transactions grouped by a comma-separated list of
+    dimensions: at most one of day, week, month, quarter and year, plus any of
+    category, account and type. type may be repeated to include several types.
+    """
+    try:
+        return reports.get_summary(
+            db, group_by=crud.split_group_by(group_by), start_date=start_date, end_date=end_date, types=type,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get("/transactions/summary/by-category", response_model=Dict[str, float])
 def read_summary_by_category(
     start_date: Optional[date] = None,
@@ -112,7 +423,7 @@ def read_summary_by_category(
     type: str = "Expense",
     db: Session = Depends(get_db),
 ):
-    summary = crud.get_summary_by_category(
+    summary = reports.get_summary_by_category(
         db=db, start_date=start_date, end_date=end_date, type=type
     )
     return summary
@@ -124,7 +435,7 @@ def read_summary_by_month(
     type: str = "Expense",
     db: Session = Depends(get_db),
 ):
-    summary = crud.get_summary_by_month(
+    summary = reports.get_summary_by_month(
         db=db, start_date=start_date, end_date=end_date, type=type
     )
     return summary
@@ -196,6 +507,14 @@ def delete_account_by_id(account_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=403, detail="Account is in use and cannot be deleted")
     return {"message": "Account deleted successfully"}
 
+@app.get("/reference-data", response_model=schemas.ReferenceData)
+def read_reference_data(db: Session = Depends(get_db)):
+    """
+    API endpoint to retrieve the accounts and the income and expense
+    categories in one response, for the forms that offer them as choices.
+    """
+    return crud.get_reference_data(db=db)
+
 @app.get("/accounts/balances", response_model=Dict[str, float])
 def read_account_balances(db: Session = Depends(get_db)):
     """
@@ -293,7 +612,50 @@ def read_budgets_status(db: Session = Depends(get_db)):
     """
     API endpoint to receive the calculated status of all current budgets.
     """
-    return crud.get_budgets_status(db=db)
+    return reports.get_budgets_status(db=db)
+
+
+# --- DASHBOARD ---
+@app.get("/dashboard", response_model=schemas.Dashboard)
+def read_dashboard(db: Session = Depends(get_db)):
+    """
+    API endpoint to retrieve account balances, net worth history and budget
+    status in one response.
+    """
+    return crud.get_dashboard(db=db)
+
+
+# --- MONITORING ---
+@app.get("/stats/caches")
+def read_cache_stats():
+    """
+    API endpoint to report hit/miss counters of the in-process caches.
+    """
+    return {
+        "transaction_count": transaction_count_cache.stats(),
+        "data_versions": data_versions.stats(),
+        "responses": response_cache.stats(),
+        "reference_data": reference_data.stats(),
+        "analytics": analytics_engine.stats() if analytics_engine else None,
+    }
+
+@app.get("/stats/startup")
+def read_startup_timings():
+    """
+    API endpoint to report the milliseconds spent in each startup phase.
+    The scheduled jobs run in the background; their durations are under jobs.
+    """
+    return {
+        "phases": startup_timings,
+        "jobs": {name: job.last_duration for name, job in scheduler.jobs.items()},
+    }
+
+@app.get("/stats/scheduler")
+def read_scheduler_status():
+    """
+    API endpoint to report the background jobs, their last runs and the next scheduled run.
+    """
+    return scheduler.status()
 
 # Define the path to the frontend build directory
 FRONTEND_BUILD_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'frontend', 'dist')
@@ -317,4 +679,7 @@ def serve_frontend(catchall: str):
         return FileResponse(file_path)
     
     # If it's not a file, it's a client-side route, serve index.html
-    return FileResponse(os.path.join(FRONTEND_BUILD_DIR, 'index.html'))
\ No newline at end of file
+    return FileResponse(os.path.join(FRONTEND_BUILD_DIR, 'index.html'))
+
+# Module fully imported, see IMPORTS_STARTED
+IMPORTS_FINISHED = timer.perf_counter()
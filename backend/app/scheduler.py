@@ -0,0 +1,117 @@
+import asyncio
+import time as timer
+import traceback
+from datetime import datetime, time, timedelta, timezone
+
+
+class Job:
+    """
+    A named piece of blocking work run by the Scheduler, along with the
+    metrics of its past runs.
+    """
+
+    def __init__(self, name: str, func):
+        self.name = name
+        self.func = func
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_started = None
+        self.last_finished = None
+        self.last_duration = None
+        self.last_result = None
+        self.last_error = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def running(self):
+        return self._lock.locked()
+
+    async def run(self):
+        """
+        Runs the job in a worker thread. A run requested while the previous
+        one is still going is skipped rather than queued.
+        """
+        if self._lock.locked():
+            self.skipped += 1
+            return
+        async with self._lock:
+            self.last_started = datetime.now(timezone.utc)
+            started = timer.perf_counter()
+            try:
+                self.last_result = await asyncio.to_thread(self.func)
+                self.last_error = None
+            except Exception:
+                self.failures += 1
+                self.last_error = traceback.format_exc(limit=5)
+                print(f"Scheduled job {self.name} failed:\n{self.last_error}")
+            finally:
+                self.runs += 1
+                self.last_duration = timer.perf_counter() - started
+                self.last_finished = datetime.now(timezone.utc)
+
+    def status(self):
+        return {
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "last_started": self.last_started,
+            "last_finished": self.last_finished,
+            "last_duration_seconds": self.last_duration,
+            "last_result": self.last_result,
+            "last_error": self.last_error,
+        }
+
+
+class Scheduler:
+    """
+    Runs jobs in the background of the server process: once right after
+    startup, then every day at daily_at (UTC). Jobs run one after another
+    in the order they were added, off the request path.
+    """
+
+    def __init__(self, daily_at: time):
+        self.daily_at = daily_at
+        self.jobs = {}
+        self.next_run = None
+        self._task = None
+
+    def add_job(self, name: str, func):
+        self.jobs[name] = Job(name, func)
+
+    async def run_all(self):
+        for job in self.jobs.values():
+            await job.run()
+
+    def start(self):
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _loop(self):
+        while True:
+            await self.run_all()
+            self.next_run = self._next_run_after(datetime.now(timezone.utc))
+            await asyncio.sleep((self.next_run - datetime.now(timezone.utc)).total_seconds())
+
+    def _next_run_after(self, now: datetime):
+        next_run = datetime.combine(now.date(), self.daily_at, tzinfo=timezone.utc)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        return next_run
+
+    def status(self):
+        return {
+            "daily_at": self.daily_at.isoformat(),
+            "next_run": self.next_run,
+            "jobs": {name: job.status() for name, job in self.jobs.items()},
+        }
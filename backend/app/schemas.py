@@ -1,11 +1,16 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, List
+from typing import Annotated, Optional, List, Dict
+
+# Amounts are stored as BIGINT minor units, so NaN, infinities and values
+# whose cents (or sums of them) would not fit are rejected on input
+MAX_AMOUNT = 10 ** 12
+Amount = Annotated[float, Field(allow_inf_nan=False, ge=-MAX_AMOUNT, le=MAX_AMOUNT)]
 
 # Base schema with fields common to both creating and reading transactions
 class TransactionBase(BaseModel):
     type: str
-    amount: float
+    amount: Amount
     category: str
     description: Optional[str] = None
     from_account: Optional[str] = None
@@ -15,11 +20,24 @@ class TransactionBase(BaseModel):
 class TransactionCreate(TransactionBase):
     pass
 
+# Schema for a row of a bulk import, which may carry its own date
+class TransactionImport(TransactionCreate):
+    date: Optional[datetime] = None
+
+class BulkImportError(BaseModel):
+    row: int
+    errors: List[str]
+
+class BulkImportResult(BaseModel):
+    inserted_count: int
+    errors: List[BulkImportError]
+
 # Schema for reading transaction
 # Includes fields that are generated by the database
 class Transaction(TransactionBase):
     id: int
-    date: datetime
+    # Rows written outside the API may have no date
+    date: Optional[datetime] = None
 
     # This tells Pydantic to read the data even if it's not a dict
     # but an ORM model (SQLAlchemy model)
@@ -49,9 +67,24 @@ class Account(AccountBase):
     class Config:
         from_attributes = True
 
+# Everything the transaction and recurring forms need, in one response
+class ReferenceData(BaseModel):
+    accounts: List[Account]
+    income_categories: List[Category]
+    expense_categories: List[Category]
+
 class TransactionPage(BaseModel):
-    total_count: int
+    # None when the caller asked to skip counting
+    total_count: Optional[int] = None
     transactions: List[Transaction]
+    # Opaque cursor for the next page, None on the last page
+    next_cursor: Optional[str] = None
+
+# Grouped totals in columnar form: one list per group_by dimension plus
+# "total" and "count", all of the same length
+class Summary(BaseModel):
+    group_by: List[str]
+    columns: Dict[str, list]
 
 class NetWorthHistory(BaseModel):
     date: datetime
@@ -63,7 +96,7 @@ class NetWorthHistory(BaseModel):
 class RecurringTransactionBase(BaseModel):
     day_of_month: int
     type: str
-    amount: float
+    amount: Amount
     category: str
     description: str
     from_account: Optional[str] = None
@@ -81,7 +114,7 @@ class RecurringTransaction(RecurringTransactionBase):
 
 class BudgetBase(BaseModel):
     category_name: str
-    amount: float
+    amount: Amount
 
 class BudgetCreate(BudgetBase):
     pass
@@ -97,4 +130,9 @@ class BudgetStatus(BaseModel):
     category_name: str
     budgeted_amount: float
     spent_amount: float
-    remaining_amount: float
\ No newline at end of file
+    remaining_amount: float
+
+class Dashboard(BaseModel):
+    balances: Dict[str, float]
+    net_worth_history: List[NetWorthHistory]
+    budget_status: List[BudgetStatus]
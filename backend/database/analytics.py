@@ -0,0 +1,424 @@
+"""
+An optional in-memory, columnar copy of the transactions table for reports.
+
+The ledger is loaded in chunks into NumPy arrays: the epoch day of each
+transaction, its amount in minor units, and dictionary-encoded type,
+category and account codes. Summaries, balances and budget status are then
+answered with vectorized group-bys (np.unique and np.bincount) instead of
+SQL, and return exactly what the matching crud functions return.
+
+Transactions inserted through crud are appended on the next read; edits and
+deletes reload the whole table, as does an append that finds a row with a
+lower id than one already loaded. Like the other in-process caches, it only
+sees writes made by this process.
+"""
+from datetime import date, datetime, timedelta, timezone
+from threading import Lock
+from typing import List, Optional
+import itertools
+import os
+
+from sqlalchemy import BigInteger, func, type_coerce
+from sqlalchemy.orm import Session
+
+from . import crud, models
+from .cache import reference_data
+from app import schemas
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Set FINANCIAL_TRACKER_ANALYTICS=true to serve summaries and budget status
+# from the analytics engine. This needs numpy.
+ANALYTICS_ENABLED = os.environ.get("FINANCIAL_TRACKER_ANALYTICS", "false").lower() in ("1", "true", "yes")
+
+# Rows fetched per round trip while loading the ledger
+ANALYTICS_CHUNK_SIZE = 10000
+
+# Group-bys with at most this many possible groups (or one per row) count
+# into a dense array instead of sorting the group keys
+DENSE_GROUP_LIMIT = 1 << 16
+
+# Dialects whose ids are assigned in commit order. SQLite has one writer at
+# a time; PostgreSQL hands out sequence values at insert time, so a
+# transaction that inserted earlier can commit a lower id after a higher one.
+IDS_IN_COMMIT_ORDER = ("sqlite",)
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Epoch day stored for transactions without a date. As in crud, they count
+# towards balances but not towards any summary, since the monthly rollup the
+# SQL summaries read has no month to put them in.
+_NO_DAY = -2 ** 31
+
+
+def _epoch_day(day: date) -> int:
+    return day.toordinal() - _EPOCH_ORDINAL
+
+
+class _Column:
+    """
+    A growable NumPy array that doubles its capacity as rows are appended.
+    """
+
+    def __init__(self, dtype):
+        self._data = np.empty(1024, dtype=dtype)
+        self._size = 0
+
+    def extend(self, values):
+        needed = self._size + len(values)
+        if needed > len(self._data):
+            grown = np.empty(max(needed, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size:needed] = values
+        self._size = needed
+
+    @property
+    def values(self):
+        return self._data[:self._size]
+
+
+class _Dictionary:
+    """
+    Maps values to dense integer codes in order of first appearance.
+    """
+
+    def __init__(self, *initial):
+        self.values = []
+        self._codes = {}
+        for value in initial:
+            self.encode(value)
+
+    def encode(self, value) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def code(self, value) -> Optional[int]:
+        return self._codes.get(value)
+
+
+class AnalyticsEngine:
+    """
+    Answers the reporting queries from a columnar copy of the ledger.
+    The methods take the same arguments as their crud counterparts; the
+    session is used to load rows and to read budgets.
+    """
+
+    def __init__(self, chunk_size: int = ANALYTICS_CHUNK_SIZE):
+        if np is None:
+            raise RuntimeError("The analytics engine needs numpy; install it with `uv pip install numpy`")
+        self.chunk_size = chunk_size
+        self.loads = 0
+        self.appends = 0
+        self._lock = Lock()
+        self._reset()
+        crud.transaction_write_listeners.append(self._transactions_written)
+
+    def _reset(self):
+        self._days = _Column(np.int32)
+        self._amounts = _Column(np.int64)   # minor units
+        self._types = _Column(np.int16)
+        self._categories = _Column(np.int32)
+        self._from_accounts = _Column(np.int32)
+        self._to_accounts = _Column(np.int32)
+        self._type_codes = _Dictionary()
+        self._category_codes = _Dictionary()
+        # Code 0 is the missing account, so it doubles as crud's NO_ACCOUNT_ID
+        self._account_codes = _Dictionary(models.NO_ACCOUNT_ID)
+        self._last_id = 0
+        # Nothing is loaded until the first read
+        self._stale = True
+        self._appended = False
+
+    def _transactions_written(self, appended_only: bool):
+        with self._lock:
+            if appended_only:
+                self._appended = True
+            else:
+                self._stale = True
+
+    def _sync(self, db: Session):
+        """
+        Brings the arrays up to date with the ledger. Call with the lock held.
+        """
+        if self._stale:
+            self._reload(db)
+        elif self._appended:
+            self._appended = False
+            self._load(db)
+            self.appends += 1
+            if self._missed_rows(db):
+                self._reload(db)
+
+    def _reload(self, db: Session):
+        self._reset()
+        self._stale = False
+        self._load(db)
+        self.loads += 1
+
+    def _missed_rows(self, db: Session) -> bool:
+        """
+        Returns whether rows with ids at or below the last one loaded have
+        committed since they were read past, which appending by id misses.
+        """
+        if db.get_bind().dialect.name in IDS_IN_COMMIT_ORDER:
+            return False
+        committed = db.query(func.count(models.Transaction.id)).filter(models.Transaction.id <= self._last_id).scalar()
+        return committed != len(self._days.values)
+
+    def _load(self, db: Session):
+        """
+        Appends the transactions newer than the last one loaded, a chunk at a time.
+        """
+        query = db.query(
+            models.Transaction.id,
+            models.Transaction.date,
+            models.Transaction.type,
+            # The stored minor units, without converting them to floats
+            type_coerce(models.Transaction.amount, BigInteger),
+            models.Transaction.category_id,
+            models.Transaction.from_account_id,
+            models.Transaction.to_account_id,
+        ).filter(models.Transaction.id > self._last_id).order_by(models.Transaction.id)
+
+        rows = query.yield_per(self.chunk_size)
+        for chunk in itertools.batched(rows, self.chunk_size):
+            ids, days, types, amounts, categories, from_accounts, to_accounts = zip(*chunk)
+            self._days.extend(np.fromiter(
+                (_NO_DAY if day is None else _epoch_day(day.date()) for day in days), np.int32, len(days),
+            ))
+            self._amounts.extend(np.array(amounts, dtype=np.int64))
+            self._types.extend(np.fromiter(map(self._type_codes.encode, types), np.int16, len(types)))
+            self._categories.extend(np.fromiter(map(self._category_codes.encode, categories), np.int32, len(categories)))
+            self._from_accounts.extend(np.fromiter(
+                (self._account_codes.encode(account_id or models.NO_ACCOUNT_ID) for account_id in from_accounts),
+                np.int32, len(from_accounts),
+            ))
+            self._to_accounts.extend(np.fromiter(
+                (self._account_codes.encode(account_id or models.NO_ACCOUNT_ID) for account_id in to_accounts),
+                np.int32, len(to_accounts),
+            ))
+            self._last_id = max(self._last_id, max(ids))
+
+    def _mask(self, start_date: Optional[date], end_date: Optional[date], types: Optional[List[str]]):
+        """
+        Returns a boolean mask of the dated rows in the inclusive date range
+        with one of the given types.
+        """
+        days = self._days.values
+        mask = days != _NO_DAY
+        if start_date:
+            mask &= days >= _epoch_day(start_date)
+        if end_date:
+            mask &= days <= _epoch_day(end_date)
+        if types:
+            codes = [self._type_codes.code(type) for type in types]
+            mask &= np.isin(self._types.values, [code for code in codes if code is not None])
+        return mask
+
+    def _group(self, columns, amounts):
+        """
+        Groups rows by the combination of their codes in columns.
+        Returns (keys, totals, counts), where keys holds one array of codes per
+        column and totals are in minor units.
+        """
+        if not columns:
+            if len(amounts) == 0:
+                return [], np.empty(0, np.int64), np.empty(0, np.int64)
+            return [], np.array([amounts.sum()]), np.array([len(amounts)])
+
+        # Pack the codes into one int64 per row, one digit per column
+        offsets = []
+        size = 1
+        combined = np.zeros(len(amounts), dtype=np.int64)
+        for codes in columns:
+            low = int(codes.min()) if len(codes) else 0
+            radix = (int(codes.max()) - low + 1) if len(codes) else 1
+            combined = combined * radix + (codes - low)
+            offsets.append((low, radix))
+            size *= radix
+
+        if size <= max(len(amounts), DENSE_GROUP_LIMIT):
+            # Few possible groups: count straight into a slot per group
+            counts = np.bincount(combined, minlength=size)
+            weights = np.bincount(combined, weights=amounts, minlength=size)
+            unique = np.flatnonzero(counts)
+            counts, weights = counts[unique], weights[unique]
+        else:
+            unique, inverse = np.unique(combined, return_inverse=True)
+            counts = np.bincount(inverse, minlength=len(unique))
+            weights = np.bincount(inverse, weights=amounts, minlength=len(unique))
+        # float64 adds whole minor units exactly up to 2**53
+        totals = np.rint(weights).astype(np.int64)
+
+        keys = []
+        for low, radix in reversed(offsets):
+            unique, digits = np.divmod(unique, radix)
+            keys.append(digits + low)
+        keys.reverse()
+        return keys, totals, counts
+
+    def get_summary(
+        self,
+        db: Session,
+        group_by: List[str],
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        types: Optional[List[str]] = None,
+    ):
+        """
+        Same as crud.get_summary.
+        """
+        bucket = crud.summary_time_bucket(group_by)
+        with self._lock:
+            self._sync(db)
+            mask = self._mask(start_date, end_date, types)
+
+            def selected(column):
+                return column.values[mask]
+
+            columns, decoders = [], []
+            for dimension in group_by:
+                if dimension == bucket:
+                    columns.append(_bucket_codes(selected(self._days), bucket))
+                    decoders.append(lambda code, bucket=bucket: _bucket_label(code, bucket))
+                elif dimension == "category":
+                    columns.append(selected(self._categories))
+                    decoders.append(self._category_codes.values.__getitem__)
+                elif dimension == "account":
+                    from_accounts = selected(self._from_accounts)
+                    # The account money left, or the one it arrived in for income
+                    columns.append(np.where(from_accounts != 0, from_accounts, selected(self._to_accounts)))
+                    decoders.append(self._account_codes.values.__getitem__)
+                else:
+                    columns.append(selected(self._types))
+                    decoders.append(self._type_codes.values.__getitem__)
+
+            keys, totals, counts = self._group(columns, selected(self._amounts))
+
+        groups = {}
+        for index in range(len(totals)):
+            key = tuple(decode(int(codes[index])) for decode, codes in zip(decoders, keys))
+            groups[key] = (int(totals[index]) / models.MINOR_UNITS, int(counts[index]))
+        return crud.summary_columns(group_by, groups)
+
+    def get_summary_by_category(
+        self,
+        db: Session,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        type: str = "Expense",
+    ):
+        """
+        Same as crud.get_summary_by_category.
+        """
+        columns = self.get_summary(db, ["category"], start_date=start_date, end_date=end_date, types=[type])["columns"]
+        return dict(zip(columns["category"], columns["total"]))
+
+    def get_summary_by_month(
+        self,
+        db: Session,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        type: str = "Expense",
+    ):
+        """
+        Same as crud.get_summary_by_month.
+        """
+        columns = self.get_summary(db, ["month"], start_date=start_date, end_date=end_date, types=[type])["columns"]
+        return dict(zip(columns["month"], columns["total"]))
+
+    def get_account_balances(self, db: Session):
+        """
+        Same as crud.compute_account_balances: every account's balance from
+        the full ledger.
+        """
+        with self._lock:
+            self._sync(db)
+            size = len(self._account_codes.values)
+            amounts = self._amounts.values
+            balances = (
+                np.bincount(self._to_accounts.values, weights=amounts, minlength=size)
+                - np.bincount(self._from_accounts.values, weights=amounts, minlength=size)
+            )
+            by_id = {
+                account_id: int(np.rint(balance)) / models.MINOR_UNITS
+                for account_id, balance in zip(self._account_codes.values, balances)
+            }
+        return {row["name"]: by_id.get(row["id"], 0.0) for row in reference_data.rows("accounts")}
+
+    def get_budgets_status(self, db: Session):
+        """
+        Same as crud.get_budgets_status.
+        """
+        today = datetime.now(timezone.utc).date()
+        with self._lock:
+            self._sync(db)
+            mask = self._mask(today.replace(day=1), today, ["Expense"])
+            spent = np.bincount(
+                self._categories.values[mask],
+                weights=self._amounts.values[mask],
+                minlength=len(self._category_codes.values),
+            )
+            spent_by_category = {
+                category_id: int(np.rint(total))
+                for category_id, total in zip(self._category_codes.values, spent)
+            }
+
+        budget_statuses = []
+        for budget in db.query(models.Budget).all():
+            # Back to minor units, so the remaining amount is exact
+            budgeted = round(budget.amount * models.MINOR_UNITS)
+            spent_amount = spent_by_category.get(budget.category_id, 0)
+            budget_statuses.append(schemas.BudgetStatus(
+                category_name=budget.category_name,
+                budgeted_amount=budget.amount,
+                spent_amount=spent_amount / models.MINOR_UNITS,
+                remaining_amount=(budgeted - spent_amount) / models.MINOR_UNITS,
+            ))
+        return budget_statuses
+
+    def stats(self):
+        with self._lock:
+            return {
+                "rows": len(self._amounts.values),
+                "loads": self.loads,
+                "appends": self.appends,
+                "stale": self._stale,
+            }
+
+
+def _bucket_codes(days, bucket: str):
+    """
+    Maps epoch days to integer time bucket codes, decoded by _bucket_label.
+    """
+    if bucket == "day":
+        return days
+    if bucket == "week":
+        # 1970-01-01 was a Thursday, three days after a Monday
+        return days - (days + 3) % 7
+    if bucket == "year":
+        return days.astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64)
+    months = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    return months // 3 if bucket == "quarter" else months
+
+def _bucket_label(code: int, bucket: str) -> str:
+    """
+    Returns the label crud.time_bucket gives the bucket with this code.
+    """
+    if bucket in ("day", "week"):
+        return (date(1970, 1, 1) + timedelta(days=code)).isoformat()
+    if bucket == "month":
+        return f"{1970 + code // 12:04d}-{code % 12 + 1:02d}"
+    if bucket == "quarter":
+        return f"{1970 + code // 4:04d}-Q{code % 4 + 1}"
+    return f"{1970 + code:04d}"
+
+
+analytics_engine = AnalyticsEngine() if ANALYTICS_ENABLED else None
@@ -0,0 +1,65 @@
+"""
+Async counterparts of the read-heavy crud functions.
+
+Each function runs the matching query from crud.py through
+AsyncSession.run_sync, so the SQL is shared with the sync path while the
+database I/O is awaited through the async driver instead of blocking a
+threadpool worker.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import List, Optional
+
+from . import crud
+from .analytics import analytics_engine
+
+# Summaries and budget status come from the analytics engine when enabled
+reports = analytics_engine or crud
+
+
+async def get_transactions(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_count: bool = True,
+):
+    return await db.run_sync(
+        crud.get_transactions,
+        skip=skip, limit=limit, start_date=start_date, end_date=end_date, type=type,
+        cursor=cursor, include_count=include_count,
+    )
+
+async def get_summary_by_category(
+    db: AsyncSession,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    type: str = "Expense",
+):
+    return await db.run_sync(reports.get_summary_by_category, start_date=start_date, end_date=end_date, type=type)
+
+async def get_summary_by_month(
+    db: AsyncSession,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    type: str = "Expense",
+):
+    return await db.run_sync(reports.get_summary_by_month, start_date=start_date, end_date=end_date, type=type)
+
+async def get_summary(
+    db: AsyncSession,
+    group_by: List[str],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    types: Optional[List[str]] = None,
+):
+    return await db.run_sync(reports.get_summary, group_by=group_by, start_date=start_date, end_date=end_date, types=types)
+
+async def get_account_balances(db: AsyncSession):
+    return await db.run_sync(crud.get_account_balances)
+
+async def get_budgets_status(db: AsyncSession):
+    return await db.run_sync(reports.get_budgets_status)
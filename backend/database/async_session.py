@@ -0,0 +1,41 @@
+from sqlalchemy import event
+import os
+
+from .session import (
+    SQLALCHEMY_DATABASE_URL,
+    IS_SQLITE,
+    apply_sqlite_profile,
+    pool_args,
+)
+
+# Set FINANCIAL_TRACKER_ASYNC_DB=true to serve the hot read endpoints from
+# async handlers. This needs an async driver: aiosqlite for SQLite, or
+# psycopg / asyncpg for PostgreSQL.
+ASYNC_DB_ENABLED = os.environ.get("FINANCIAL_TRACKER_ASYNC_DB", "false").lower() in ("1", "true", "yes")
+
+def _async_url(url: str) -> str:
+    """
+    Derives the async driver URL from the sync database URL.
+    """
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    if url.startswith("postgresql:"):
+        return "postgresql+asyncpg:" + url[len("postgresql:"):]
+    # psycopg (v3) supports asyncio under the same URL
+    return url
+
+ASYNC_DATABASE_URL = os.environ.get("FINANCIAL_TRACKER_ASYNC_DATABASE_URL", _async_url(SQLALCHEMY_DATABASE_URL))
+
+async_engine = None
+AsyncSessionLocal = None
+
+if ASYNC_DB_ENABLED:
+    # Only imported when enabled, as it needs greenlet and an async driver
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **pool_args(ASYNC_DATABASE_URL))
+    if IS_SQLITE:
+        event.listen(async_engine.sync_engine, "connect", apply_sqlite_profile)
+
+    # Objects are read after the handler returns, so keep them loaded
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
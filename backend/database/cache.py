@@ -0,0 +1,288 @@
+from collections import OrderedDict
+from threading import Lock
+import os
+import uuid
+
+
+class GenerationCache:
+    """
+    A small in-process cache whose entries are tied to a generation number.
+    Bumping the generation invalidates every entry at once, so write paths
+    only need to call bump() after they commit. max_entries=0 disables it.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = Lock()
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the cached value for key, calling compute() on a miss.
+        """
+        if self.max_entries <= 0:
+            return compute()
+        with self._lock:
+            generation = self.generation
+            if key in self._entries:
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            # Only store the value if no write happened while computing it
+            if generation == self.generation:
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+                self._entries[key] = value
+        return value
+
+    def bump(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "generation": self.generation,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class DataVersions:
+    """
+    Per-table change counters, bumped by crud after every committed write.
+    Read endpoints turn them into ETags, so a client can tell whether the
+    data behind a response changed without the database being queried.
+    The counters live in this process, so they only stay accurate while a
+    single server process handles all writes.
+    """
+
+    def __init__(self):
+        # Distinguishes this process's counters from a previous run's
+        self.boot_id = uuid.uuid4().hex[:12]
+        self._versions = {}
+        self._lock = Lock()
+
+    def bump(self, *tables):
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def get(self, *tables):
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in tables)
+
+    def etag(self, *tables, extra: str = ""):
+        """
+        Returns a strong ETag covering the current version of the given tables.
+        """
+        versions = "-".join(str(version) for version in self.get(*tables))
+        return f'"{self.boot_id}-{versions}{"-" + extra if extra else ""}"'
+
+    def stats(self):
+        with self._lock:
+            return {"boot_id": self.boot_id, "versions": dict(self._versions)}
+
+
+class ResponseCache:
+    """
+    An LRU cache of serialized responses, bounded by entry count and total
+    body size. Keys include the data version the response was built from,
+    so entries for outdated data are never hit again and age out.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, body: bytes, media_type: str):
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key)[0])
+            self._entries[key] = (body, media_type)
+            self._size += len(body)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, (evicted_body, _) = self._entries.popitem(last=False)
+                self._size -= len(evicted_body)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class ReferenceData:
+    """
+    An in-process copy of the accounts and categories tables, keyed by kind
+    ("accounts" or "categories") and id. Forms, duplicate checks and rows
+    that reference them by id are served from it without a query.
+
+    The rows are loaded on first use through the loader crud sets, and crud
+    writes them through with put() and remove() after each commit. A name
+    that is not found is treated as not existing. An id that is not found
+    was read from the database, so its row was created outside of crud
+    (e.g. by another process) and is fetched on its own with the row loader.
+    """
+
+    def __init__(self):
+        self.loads = 0
+        self.hits = 0
+        self.misses = 0
+        self._loader = None
+        self._row_loader = None
+        self._rows = None
+        self._ids = None
+        self._lock = Lock()
+
+    def set_loader(self, loader, row_loader):
+        """
+        loader() returns {kind: [row dict, ...]} for "accounts" and "categories",
+        and row_loader(kind, id) returns one row dict, or None.
+        """
+        self._loader = loader
+        self._row_loader = row_loader
+
+    def rows(self, kind: str):
+        """
+        Returns the rows of one kind as dicts, ordered by name.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            self.hits += 1
+            return sorted(self._rows[kind].values(), key=lambda row: row["name"])
+
+    def get(self, kind: str, id: int):
+        if id is None:
+            return None
+        row = self._lookup(lambda: self._rows[kind].get(id))
+        if row is None:
+            row = self._row_loader(kind, id)
+            if row is not None:
+                self.put(kind, row)
+        return row
+
+    def name(self, kind: str, id: int):
+        row = self.get(kind, id)
+        return row["name"] if row else None
+
+    def find(self, kind: str, name: str):
+        """
+        Returns the row with the given name, or None.
+        """
+        if name is None:
+            return None
+        return self._lookup(lambda: self._rows[kind].get(self._ids[kind].get(name)))
+
+    def id(self, kind: str, name: str):
+        row = self.find(kind, name)
+        return row["id"] if row else None
+
+    def put(self, kind: str, row: dict):
+        """
+        Adds or replaces a row after it was committed.
+        """
+        with self._lock:
+            if self._rows is None:
+                return
+            self._remove(kind, row["id"])
+            self._rows[kind][row["id"]] = row
+            self._ids[kind][row["name"]] = row["id"]
+
+    def remove(self, kind: str, id: int):
+        with self._lock:
+            if self._rows is not None:
+                self._remove(kind, id)
+
+    def invalidate(self):
+        with self._lock:
+            self._rows = None
+            self._ids = None
+
+    def _remove(self, kind, id):
+        old = self._rows[kind].pop(id, None)
+        if old is not None:
+            self._ids[kind].pop(old["name"], None)
+
+    def _lookup(self, find):
+        with self._lock:
+            self._ensure_loaded()
+            found = find()
+            if found is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return found
+
+    def _ensure_loaded(self):
+        if self._rows is None:
+            self._load()
+
+    def _load(self):
+        loaded = self._loader()
+        self._rows = {kind: {row["id"]: row for row in rows} for kind, rows in loaded.items()}
+        self._ids = {kind: {row["name"]: id for id, row in rows.items()} for kind, rows in self._rows.items()}
+        self.loads += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "loaded": self._rows is not None,
+                "loads": self.loads,
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": {kind: len(rows) for kind, rows in (self._rows or {}).items()},
+            }
+
+
+# Total row counts for filtered transaction listings, keyed by the filter.
+# Set FINANCIAL_TRACKER_COUNT_CACHE_ENTRIES to enable it; like the response
+# cache it is only invalidated by writes made through this process.
+transaction_count_cache = GenerationCache(
+    max_entries=int(os.environ.get("FINANCIAL_TRACKER_COUNT_CACHE_ENTRIES", "0")),
+)
+
+data_versions = DataVersions()
+
+reference_data = ReferenceData()
+
+# Set FINANCIAL_TRACKER_RESPONSE_CACHE_ENTRIES to enable the response cache.
+# It is keyed on this process's data versions, so it goes stale when another
+# process writes to the database.
+response_cache = ResponseCache(
+    max_entries=int(os.environ.get("FINANCIAL_TRACKER_RESPONSE_CACHE_ENTRIES", "0")),
+    max_bytes=int(os.environ.get("FINANCIAL_TRACKER_RESPONSE_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+)
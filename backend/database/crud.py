@@ -1,11 +1,153 @@
 from . import models
+from .cache import transaction_count_cache, data_versions, reference_data
+from .session import SessionLocal
 from app import schemas
-from sqlalchemy import func
+from sqlalchemy import Float, Integer, String, case, cast, column, func, insert, literal, literal_column, table, type_coerce
+from sqlalchemy.dialects import postgresql, sqlite
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from datetime import datetime, date, timedelta, timezone
-from typing import Optional
+from datetime import datetime, date, time, timedelta, timezone
+from typing import List, Optional
+import base64
+import calendar
+import itertools
+import re
+
+# --- REFERENCE DATA ---
+def _account_row(db_account: models.Account):
+    return {"id": db_account.id, "name": db_account.name}
+
+def _category_row(db_category: models.Category):
+    return {"id": db_category.id, "name": db_category.name, "type": db_category.type}
+
+def _load_reference_data():
+    """
+    Reads every account and category for the reference_data cache.
+    """
+    db = SessionLocal()
+    try:
+        return {
+            "accounts": [_account_row(row) for row in db.query(models.Account).all()],
+            "categories": [_category_row(row) for row in db.query(models.Category).all()],
+        }
+    finally:
+        db.close()
+
+def _load_reference_row(kind: str, id: int):
+    """
+    Reads one account or category for the reference_data cache.
+    """
+    model = models.Account if kind == "accounts" else models.Category
+    db = SessionLocal()
+    try:
+        db_row = db.get(model, id)
+        if db_row is None:
+            return None
+        return _account_row(db_row) if model is models.Account else _category_row(db_row)
+    finally:
+        db.close()
+
+reference_data.set_loader(_load_reference_data, _load_reference_row)
+
+def get_reference_data(db: Session):
+    """
+    Returns the accounts and the income and expense categories, which is
+    everything the transaction and recurring forms offer to pick from.
+    """
+    categories = reference_data.rows("categories")
+    return {
+        "accounts": reference_data.rows("accounts"),
+        "income_categories": [row for row in categories if row["type"] == "Income"],
+        "expense_categories": [row for row in categories if row["type"] == "Expense"],
+    }
+
+def _category_id(db: Session, name: str, type: str):
+    """
+    Returns the id of the named category, creating it with the given type if
+    it does not exist yet. The caller commits.
+    """
+    return _reference_id(db, models.Category, name) or _get_or_insert_id(db, models.Category, name=name, type=type)
+
+def _account_id(db: Session, name: Optional[str]):
+    """
+    Returns the id of the named account, creating it if it does not exist
+    yet, or None for no account. The caller commits.
+    """
+    if not name:
+        return None
+    return _reference_id(db, models.Account, name) or _get_or_insert_id(db, models.Account, name=name)
+
+def _reference_id(db: Session, model, name: str):
+    """
+    Returns the id of an account or category created earlier in the session's
+    transaction or already committed, or None, without querying the database.
+    """
+    pending = db.info.get("pending_reference_rows")
+    if pending:
+        row = pending.get((model.__tablename__, name))
+        if row is not None:
+            return row["id"]
+    return reference_data.id(model.__tablename__, name)
+
+def _get_or_insert_id(db: Session, model, **values):
+    """
+    Returns the id of the account or category named values["name"], inserting
+    it if needed. Rows inserted in the current transaction are kept in the
+    session until _reference_data_committed() is called.
+    """
+    pending = db.info.setdefault("pending_reference_rows", {})
+    key = (model.__tablename__, values["name"])
+    if key not in pending:
+        db.execute(
+            _upsert_insert(db)(model).values(**values)
+            .on_conflict_do_nothing(index_elements=[model.name])
+        )
+        db_row = db.query(model).filter(model.name == values["name"]).one()
+        pending[key] = _account_row(db_row) if model is models.Account else _category_row(db_row)
+    return pending[key]["id"]
+
+def _reference_data_committed(db: Session):
+    """
+    Adds the accounts and categories created by the transaction just
+    committed to reference_data and bumps their data version. Call after
+    every commit of a write that resolves names with _category_id or
+    _account_id.
+    """
+    pending = db.info.pop("pending_reference_rows", None)
+    if pending:
+        for (kind, _), row in pending.items():
+            reference_data.put(kind, row)
+        data_versions.bump(*{kind for kind, _ in pending})
+
+def _committed_reference_row(db: Session, model, name: str):
+    """
+    Reads the committed account or category with the given name and adds it
+    to reference_data.
+    """
+    db_row = db.query(model).filter(model.name == name).one()
+    row = _account_row(db_row) if model is models.Account else _category_row(db_row)
+    reference_data.put(model.__tablename__, row)
+    data_versions.bump(model.__tablename__)
+    return row
+
+def _transaction_values(db: Session, data: dict):
+    """
+    Turns transaction fields as given to the API, with category and account
+    names, into column values with their ids.
+    """
+    values = dict(data)
+    values["category_id"] = _category_id(db, values.pop("category"), values["type"])
+    values["from_account_id"] = _account_id(db, values.pop("from_account"))
+    values["to_account_id"] = _account_id(db, values.pop("to_account"))
+    return values
+
 
 # --- TRANSACTIONS ---
+# Listing order: newest first, with undated rows after all dated ones on
+# every database (PostgreSQL would otherwise put NULLs first)
+_NEWEST_FIRST = (models.Transaction.date.desc().nulls_last(), models.Transaction.id.desc())
+
 def get_transactions(
     db: Session,
     skip: int = 0,
@@ -13,13 +155,80 @@ def get_transactions(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_count: bool = True,
 ):
     """
     Retrieve transaction records from the database with optional filtering.
+    Pages are ordered newest first. Passing the next_cursor from a previous
+    page seeks straight to the following rows instead of using skip, so deep
+    pages cost the same as the first one.
     """
-    query = db.query(models.Transaction)
-
     # Apply filters first
+    query = _filter_transactions(db.query(models.Transaction), start_date, end_date, type)
+
+    # Get the total count before pagination. Counts are cached per filter
+    # until the next transaction write, so paging only counts once.
+    total_count = None
+    if include_count:
+        count_key = (start_date, end_date, type or None)
+        total_count = transaction_count_cache.get_or_compute(count_key, query.count)
+
+    # Get the paginated list of transactions
+    query = query.order_by(*_NEWEST_FIRST)
+    if cursor:
+        cursor_date, cursor_id = decode_transaction_cursor(cursor)
+        if cursor_date is None:
+            # Undated rows come last, so only undated rows can follow
+            query = query.filter(models.Transaction.date.is_(None), models.Transaction.id < cursor_id)
+        else:
+            # Compare against the date as stored on the cursor row so differently
+            # formatted timestamps still order consistently; fall back to the
+            # encoded date if that row has since been deleted.
+            cursor_date = func.coalesce(
+                db.query(models.Transaction.date)
+                .filter(models.Transaction.id == cursor_id)
+                .scalar_subquery(),
+                cursor_date,
+            )
+            query = query.filter(
+                (models.Transaction.date < cursor_date)
+                | ((models.Transaction.date == cursor_date) & (models.Transaction.id < cursor_id))
+                | models.Transaction.date.is_(None)
+            )
+    else:
+        query = query.offset(skip)
+
+    # Fetch one extra row to know whether another page exists
+    transactions = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        next_cursor = encode_transaction_cursor(transactions[-1])
+
+    return {"total_count": total_count, "transactions": transactions, "next_cursor": next_cursor}
+
+def iter_transactions(
+    db: Session,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    type: Optional[str] = None,
+    chunk_size: int = 1000,
+):
+    """
+    Yields every transaction matching the filters, newest first, fetching
+    chunk_size rows at a time so large exports run in constant memory.
+    """
+    query = _filter_transactions(db.query(models.Transaction), start_date, end_date, type)
+    query = query.order_by(*_NEWEST_FIRST)
+    # The session only holds weak references to loaded rows, so rows that
+    # have been written out are freed as the export goes
+    yield from query.yield_per(chunk_size)
+
+def _filter_transactions(query, start_date: Optional[date], end_date: Optional[date], type: Optional[str]):
+    """
+    Applies the shared date-range and type filters to a transactions query.
+    """
     if start_date:
         query = query.filter(models.Transaction.date >= start_date)
     if end_date:
@@ -27,32 +236,259 @@ def get_transactions(
         query = query.filter(models.Transaction.date < end_date + timedelta(days=1))
     if type:
         query = query.filter(models.Transaction.type == type)
+    return query
 
-    # Get the total count before pagination
-    total_count = query.count()
+def _apply_transaction(db: Session, db_transaction: models.Transaction, sign: int = 1):
+    """
+    Adds (sign=1) or backs out (sign=-1) a transaction's effect on every
+    table derived from the ledger. The caller commits.
+    """
+    _apply_to_balances(db, db_transaction, sign)
+    _apply_to_monthly_totals(db, db_transaction, sign)
 
-    # Get the paginated list of transactions
-    transactions = query.order_by(models.Transaction.date.desc()).offset(skip).limit(limit).all()
+# Called with appended_only after every committed transaction write, so
+# in-process copies of the ledger can follow along
+transaction_write_listeners = []
 
-    return {"total_count": total_count, "transactions": transactions}
+def _transactions_changed(db: Session, appended_only: bool = False):
+    """
+    Invalidates everything derived from the transactions table.
+    Call after every committed transaction write, with appended_only=True
+    when the write only inserted new transactions.
+    """
+    transaction_count_cache.bump()
+    data_versions.bump("transactions", "net_worth_history")
+    _reference_data_committed(db)
+    for listener in transaction_write_listeners:
+        listener(appended_only)
+
+def encode_transaction_cursor(db_transaction: models.Transaction) -> str:
+    """
+    Builds an opaque pagination cursor from a transaction's (date, id).
+    """
+    # An undated row is encoded with an empty date
+    raw = f"{db_transaction.date.isoformat() if db_transaction.date else ''}|{db_transaction.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_transaction_cursor(cursor: str):
+    """
+    Parses a cursor made by encode_transaction_cursor back into (date, id),
+    with a None date for an undated row.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        date_part, id_part = raw.rsplit("|", 1)
+        return (datetime.fromisoformat(date_part) if date_part else None), int(id_part)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+# A search term is a word, optionally ending in * to match it as a prefix
+SEARCH_TERM_PATTERN = re.compile(r"(\w+)(\*?)")
+
+# Queries matching more rows than this are returned newest first instead of
+# by relevance, since scoring every match would dominate the query time
+SEARCH_RANKED_MATCH_LIMIT = 10000
+
+def search_transactions(
+    db: Session,
+    q: str,
+    limit: int = 10,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    type: Optional[str] = None,
+    cursor: Optional[str] = None,
+):
+    """
+    Full-text search over transaction descriptions. Every word of q must
+    match; a word ending in * matches as a prefix ("coff*"). Results are
+    ordered by relevance, then newest first, and paged with the next_cursor
+    of the previous page. Queries matching more than SEARCH_RANKED_MATCH_LIMIT
+    transactions are only ordered newest first. Raises ValueError if q has
+    no words or the cursor is malformed.
+    """
+    terms = SEARCH_TERM_PATTERN.findall(q)
+    if not terms:
+        raise ValueError("Search query must contain at least one word")
+
+    # The matching transactions, the id column the matches are ordered by,
+    # and their score, where lower is a better match
+    if db.get_bind().dialect.name == "postgresql":
+        tsquery = func.to_tsquery("simple", " & ".join(word + (":*" if prefix else "") for word, prefix in terms))
+        tsvector = literal_column(models.TRANSACTION_SEARCH_TSVECTOR)
+        query = db.query(models.Transaction).filter(tsvector.op("@@")(tsquery))
+        match_id = models.Transaction.id
+        # ts_rank is a real; as a double the score round-trips through the cursor
+        score = (-func.ts_rank(tsvector, tsquery)).cast(Float)
+        matches = query.with_entities(match_id)
+    else:
+        # Each word is quoted, so FTS5 operators in the input are matched as text
+        match = " ".join(f'"{word}"{prefix}' for word, prefix in terms)
+        search_table = table(models.TRANSACTION_SEARCH_TABLE, column("rowid"))
+        match_id = search_table.c.rowid
+        match_filter = literal_column(models.TRANSACTION_SEARCH_TABLE).op("MATCH")(match)
+        matches = db.query(match_id).filter(match_filter)
+        query = db.query(models.Transaction).join(search_table, match_id == models.Transaction.id).filter(match_filter)
+        score = func.bm25(literal_column(models.TRANSACTION_SEARCH_TABLE))
+
+    if cursor:
+        cursor_score, cursor_id = decode_search_cursor(cursor)
+        # Unranked results all score 0, so the cursor tells which order it continues
+        ranked = cursor_score != 0
+    else:
+        ranked = matches.limit(SEARCH_RANKED_MATCH_LIMIT + 1).count() <= SEARCH_RANKED_MATCH_LIMIT
+
+    query = _filter_transactions(query, start_date, end_date, type)
+    if ranked:
+        query = query.add_columns(score)
+        if cursor:
+            query = query.filter((score > cursor_score) | ((score == cursor_score) & (match_id < cursor_id)))
+        query = query.order_by(score, match_id.desc())
+    else:
+        # Ordered by the id of the match alone, so the index can return the
+        # newest matches first without scoring and sorting them all
+        query = query.add_columns(literal(0.0, Float))
+        if cursor:
+            query = query.filter(match_id < cursor_id)
+        query = query.order_by(match_id.desc())
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_transaction, last_score = rows[-1]
+        next_cursor = encode_search_cursor(last_score, last_transaction.id)
+
+    return {"total_count": None, "transactions": [row[0] for row in rows], "next_cursor": next_cursor}
+
+def encode_search_cursor(score: float, transaction_id: int) -> str:
+    """
+    Builds an opaque search pagination cursor from a result's (score, id).
+    """
+    # repr() round-trips the float exactly, so equal scores compare equal
+    raw = f"{score!r}|{transaction_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_search_cursor(cursor: str):
+    """
+    Parses a cursor made by encode_search_cursor back into (score, id).
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        score_part, id_part = raw.rsplit("|", 1)
+        return float(score_part), int(id_part)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
 
 def create_transaction(db: Session, transaction: schemas.TransactionCreate):
     """
     Create a new transaction record in the database.
     """
     # Create a new SQLAlchemy model instance from schema data
-    db_transaction = models.Transaction(**transaction.model_dump())
+    db_transaction = models.Transaction(**_transaction_values(db, transaction.model_dump()))
 
-    # Add instance to the session
+    # Add instance to the session, flushing so the default date is set
     db.add(db_transaction)
+    db.flush()
+    _apply_transaction(db, db_transaction)
+    _refresh_net_worth_history(db, since=db_transaction.date.date())
 
     # Commit change
     db.commit()
+    _transactions_changed(db, appended_only=True)
 
     # Refresh instance to get new data from DB
     db.refresh(db_transaction)
     return db_transaction
 
+def bulk_create_transactions(db: Session, rows, batch_size: int = 500):
+    """
+    Validates and inserts many transactions at once.
+    rows is any iterable of dicts and is consumed lazily. Valid rows are
+    inserted batch_size at a time with a single executemany each, and
+    everything is committed together at the end. Invalid rows are skipped
+    and reported by their position in the input.
+    """
+    errors = []
+    inserted = 0
+    batch = []
+    deltas = _LedgerDeltas()
+
+    def flush_batch():
+        db.execute(insert(models.Transaction), batch)
+        batch.clear()
+
+    for index, row in enumerate(rows):
+        try:
+            transaction = schemas.TransactionImport.model_validate(row)
+        except ValidationError as e:
+            errors.append({
+                "row": index,
+                "errors": [f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()],
+            })
+            continue
+
+        values = _transaction_values(db, transaction.model_dump())
+        if values["date"] is None:
+            values["date"] = datetime.now(timezone.utc)
+        batch.append(values)
+        inserted += 1
+        deltas.add(values)
+
+        if len(batch) >= batch_size:
+            flush_batch()
+
+    if batch:
+        flush_batch()
+
+    deltas.apply(db)
+    db.commit()
+    if inserted:
+        _transactions_changed(db, appended_only=True)
+
+    return {"inserted_count": inserted, "errors": errors}
+
+class _LedgerDeltas:
+    """
+    Collects the changes a set of inserted transactions makes to the tables
+    derived from the ledger, so each derived row is updated once.
+    """
+
+    def __init__(self):
+        self.balances = {}
+        self.monthly = {}
+        self.earliest_date = None
+
+    def add(self, values):
+        """
+        Records a new transaction, given as a dict of its column values.
+        """
+        if values["to_account_id"]:
+            self.balances[values["to_account_id"]] = self.balances.get(values["to_account_id"], 0.0) + values["amount"]
+        if values["from_account_id"]:
+            self.balances[values["from_account_id"]] = self.balances.get(values["from_account_id"], 0.0) - values["amount"]
+        rollup_key = _monthly_total_key(
+            values["date"], values["type"], values["category_id"], values["from_account_id"], values["to_account_id"],
+        )
+        total, count = self.monthly.get(rollup_key, (0.0, 0))
+        self.monthly[rollup_key] = (total + values["amount"], count + 1)
+        if self.earliest_date is None or values["date"].date() < self.earliest_date:
+            self.earliest_date = values["date"].date()
+
+    def apply(self, db: Session):
+        """
+        Writes the collected changes. The caller commits.
+        """
+        for account_id, delta in self.balances.items():
+            _add_to_balance(db, account_id, delta)
+        _add_to_net_worth(db, sum(self.balances.values()))
+        for rollup_key, (total, count) in self.monthly.items():
+            _add_to_monthly_total(db, rollup_key, total, count)
+        if self.earliest_date is not None:
+            _refresh_net_worth_history(db, since=self.earliest_date)
+
 def update_transaction(db: Session, transaction_id: int, transaction: schemas.TransactionCreate):
     """
     Updates an existing transaction in the database.
@@ -60,12 +496,19 @@ def update_transaction(db: Session, transaction_id: int, transaction: schemas.Tr
     db_transaction = db.query(models.Transaction).filter(models.Transaction.id == transaction_id).first()
 
     if db_transaction:
+        # Back out the old amounts before applying the edited ones
+        _apply_transaction(db, db_transaction, sign=-1)
+
         # Update the model instance with data from Pydantic schema
-        transaction_data = transaction.model_dump()
+        transaction_data = _transaction_values(db, transaction.model_dump())
         for key, value in transaction_data.items():
             setattr(db_transaction, key, value)
 
+        _apply_transaction(db, db_transaction)
+        if db_transaction.date is not None:
+            _refresh_net_worth_history(db, since=db_transaction.date.date())
         db.commit()
+        _transactions_changed(db)
         db.refresh(db_transaction)
 
     return db_transaction
@@ -73,17 +516,22 @@ def update_transaction(db: Session, transaction_id: int, transaction: schemas.Tr
 def delete_transaction(db: Session, transaction_id: int):
     db_transaction = db.query(models.Transaction).filter(models.Transaction.id == transaction_id).first()
     if db_transaction:
+        _apply_transaction(db, db_transaction, sign=-1)
         db.delete(db_transaction)
+        if db_transaction.date is not None:
+            _refresh_net_worth_history(db, since=db_transaction.date.date())
         db.commit()
+        _transactions_changed(db)
     return db_transaction
 
 
 # --- CATEGORIES ---
 def get_categories(db: Session, type: Optional[str] = None):
-    query = db.query(models.Category)
-    if type:
-        query = query.filter(models.Category.type == type)
-    return query.order_by(models.Category.name).all()
+    """
+    Returns the categories, optionally of one type, ordered by name.
+    Served from the reference_data cache.
+    """
+    return [row for row in reference_data.rows("categories") if not type or row["type"] == type]
 
 def create_category(db: Session, category: schemas.CategoryCreate):
     """
@@ -91,82 +539,209 @@ def create_category(db: Session, category: schemas.CategoryCreate):
     Checks for duplicates based on both name and type.
     """
     # Check if a category with the same name AND type already exists
-    db_category = db.query(models.Category).filter(
-        models.Category.name == category.name,
-        models.Category.type == category.type
-    ).first()
-
-    if db_category:
-        return db_category
+    existing = reference_data.find("categories", category.name)
+    if existing and existing["type"] == category.type:
+        return existing
     
     db_category = models.Category(**category.model_dump())
     db.add(db_category)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Created outside of this process, so not in reference_data yet
+        db.rollback()
+        existing = _committed_reference_row(db, models.Category, category.name)
+        if existing["type"] != category.type:
+            raise
+        return existing
+    reference_data.put("categories", _category_row(db_category))
+    data_versions.bump("categories")
     db.refresh(db_category)
     return db_category
 
 def update_category(db: Session, category_id: int, category: schemas.CategoryCreate):
     db_category = db.query(models.Category).filter(models.Category.id == category_id).first()
     if db_category:
+        # Transactions refer to the category by id, so a rename is one row
         db_category.name = category.name
         db_category.type = category.type
         db.commit()
+        reference_data.put("categories", _category_row(db_category))
+        # Rows that refer to the category show its new name
+        data_versions.bump("categories", "transactions", "recurring_transactions", "budgets")
         db.refresh(db_category)
     return db_category
 
 def delete_category(db: Session, category_id: int):
     db_category = db.query(models.Category).filter(models.Category.id == category_id).first()
     if db_category:
-        usage_count = db.query(models.Transaction).filter(models.Transaction.category == db_category.name).count()
-        if usage_count > 0:
+        if _is_referenced(db, models.Category, db_category.id):
             return None
         
         db.delete(db_category)
         db.commit()
+        reference_data.remove("categories", category_id)
+        data_versions.bump("categories")
         return db_category
     return db_category
 
 
 # --- ACCOUNTS ---
 def get_accounts(db: Session):
-    return db.query(models.Account).order_by(models.Account.name).all()
+    """
+    Returns every account ordered by name, served from the reference_data cache.
+    """
+    return reference_data.rows("accounts")
 
 def create_account(db: Session, account: schemas.AccountCreate):
-    db_account = db.query(models.Account).filter(models.Account.name == account.name).first()
-    if db_account:
-        return db_account
+    existing = reference_data.find("accounts", account.name)
+    if existing:
+        return existing
     db_account = models.Account(**account.model_dump())
     db.add(db_account)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Created outside of this process, so not in reference_data yet
+        db.rollback()
+        return _committed_reference_row(db, models.Account, account.name)
+    reference_data.put("accounts", _account_row(db_account))
+    data_versions.bump("accounts")
     db.refresh(db_account)
     return db_account
 
 def get_account_balances(db: Session):
     """
-    Calculates the current balance for every account.
+    Returns the current balance for every account from the maintained
+    account_balances table.
+    """
+    rows = db.query(models.Account.name, models.AccountBalance.balance).outerjoin(
+        models.AccountBalance, models.AccountBalance.account_id == models.Account.id
+    ).all()
+    return {name: balance or 0.0 for name, balance in rows}
+
+def compute_account_balances(db: Session):
+    """
+    Calculates the current balance for every account from the full ledger.
     Balance = (Sum of all incoming transactions) - (Sum of all outgoing transactions)
     """
-    accounts = db.query(models.Account).all()
-    balances = {}
+    return {name: balance for _, (name, balance) in _compute_balances_by_id(db).items()}
+
+def _compute_balances_by_id(db: Session):
+    """
+    Returns {account_id: (name, balance)} for every account, from the full ledger.
+    """
+    # Incoming amounts count as positive, outgoing as negative, so a single
+    # grouped pass over the union gives every account's balance at once.
+    incoming = db.query(
+        models.Transaction.to_account_id.label("account_id"),
+        models.Transaction.amount.label("amount"),
+    ).filter(models.Transaction.to_account_id.isnot(None))
+    outgoing = db.query(
+        models.Transaction.from_account_id.label("account_id"),
+        (-models.Transaction.amount).label("amount"),
+    ).filter(models.Transaction.from_account_id.isnot(None))
+    movements = incoming.union_all(outgoing).subquery()
+
+    totals = dict(
+        db.query(movements.c.account_id, func.sum(movements.c.amount))
+        .group_by(movements.c.account_id)
+        .all()
+    )
+
+    return {
+        account_id: (name, totals.get(account_id) or 0.0)
+        for account_id, name in db.query(models.Account.id, models.Account.name).all()
+    }
+
+def rebuild_account_balances(db: Session, fix: bool = True, tolerance: float = 1e-6):
+    """
+    Recomputes every account balance from the ledger and compares it with the
+    maintained account_balances table.
+    Returns the drifted accounts as {name: (stored, actual)}. When fix is True
+    the table is rewritten with the recomputed values.
+    """
+    actual = _compute_balances_by_id(db)
+    stored = {row.account_id: row.balance for row in db.query(models.AccountBalance).all()}
+
+    drift = {}
+    for account_id, (name, balance) in actual.items():
+        stored_balance = stored.get(account_id, 0.0)
+        if abs(stored_balance - balance) > tolerance:
+            drift[name] = (stored_balance, balance)
+
+    if fix:
+        db.query(models.AccountBalance).delete()
+        db.add_all(
+            models.AccountBalance(account_id=account_id, balance=balance)
+            for account_id, (_, balance) in actual.items()
+        )
+        db.merge(models.NetWorthTotal(id=NET_WORTH_TOTAL_ID, value=sum(balance for _, balance in actual.values())))
+        db.commit()
+        data_versions.bump("transactions")
+
+    return drift
 
-    for account in accounts:
-        total_in = db.query(func.sum(models.Transaction.amount)).filter(
-            models.Transaction.to_account == account.name
-        ).scalar() or 0.0
+def _add_to_balance(db: Session, account_id: int, delta: float):
+    """
+    Atomically adds delta to an account's stored balance, creating the row
+    if it does not exist yet. The caller commits.
+    """
+    insert_stmt = _upsert_insert(db)(models.AccountBalance).values(account_id=account_id, balance=delta)
+    db.execute(insert_stmt.on_conflict_do_update(
+        index_elements=[models.AccountBalance.account_id],
+        set_={"balance": models.AccountBalance.balance + insert_stmt.excluded.balance},
+    ))
 
-        total_out = db.query(func.sum(models.Transaction.amount)).filter(
-            models.Transaction.from_account == account.name
-        ).scalar() or 0.0
+# net_worth_total holds a single row
+NET_WORTH_TOTAL_ID = 1
 
-        balances[account.name] = total_in - total_out
+def _add_to_net_worth(db: Session, delta: float):
+    """
+    Atomically adds delta to the running net worth total. The caller commits.
+    """
+    if not delta:
+        return
+    insert_stmt = _upsert_insert(db)(models.NetWorthTotal).values(id=NET_WORTH_TOTAL_ID, value=delta)
+    db.execute(insert_stmt.on_conflict_do_update(
+        index_elements=[models.NetWorthTotal.id],
+        set_={"value": models.NetWorthTotal.value + insert_stmt.excluded.value},
+    ))
+
+def _upsert_insert(db: Session):
+    """
+    Returns the dialect-specific insert() that supports ON CONFLICT.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
 
-    return balances
+def _apply_to_balances(db: Session, db_transaction: models.Transaction, sign: int = 1):
+    """
+    Adds (sign=1) or backs out (sign=-1) a transaction's effect on the
+    maintained account balances. The caller commits.
+    """
+    amount = sign * db_transaction.amount
+    net_change = 0.0
+    if db_transaction.to_account_id:
+        _add_to_balance(db, db_transaction.to_account_id, amount)
+        net_change += amount
+    if db_transaction.from_account_id:
+        _add_to_balance(db, db_transaction.from_account_id, -amount)
+        net_change -= amount
+    # Transfers move money between accounts and leave net worth unchanged
+    _add_to_net_worth(db, net_change)
 
 def update_account(db: Session, account_id: int, account: schemas.AccountCreate):
     db_account = db.query(models.Account).filter(models.Account.id == account_id).first()
     if db_account:
+        # Transactions and balances refer to the account by id, so a rename
+        # is one row and keeps the account's history
         db_account.name = account.name
         db.commit()
+        reference_data.put("accounts", _account_row(db_account))
+        # Rows that refer to the account show its new name
+        data_versions.bump("accounts", "transactions", "recurring_transactions")
         db.refresh(db_account)
     return db_account
 
@@ -174,19 +749,73 @@ def delete_account(db: Session, account_id: int):
     db_account = db.query(models.Account).filter(models.Account.id == account_id).first()
     if db_account:
         # Before deleting, check if this account is used in any transactions
-        usage_count = db.query(models.Transaction).filter(
-            (models.Transaction.from_account == db_account.name) | (models.Transaction.to_account == db_account.name)
-        ).count()
-
-        if usage_count > 0:
+        if _is_referenced(db, models.Account, db_account.id):
             return None
         
+        balance_row = db.get(models.AccountBalance, db_account.id)
+        if balance_row:
+            db.delete(balance_row)
         db.delete(db_account)
         db.commit()
+        reference_data.remove("accounts", account_id)
+        data_versions.bump("accounts")
         return db_account
     return db_account
 
 
+def _is_referenced(db: Session, model, id: int):
+    """
+    Returns whether any transaction, recurring rule or budget refers to the
+    account or category with the given id. Each check is an EXISTS that stops
+    at the first matching row.
+    """
+    if model is models.Account:
+        references = [
+            models.Transaction.from_account_id, models.Transaction.to_account_id,
+            models.RecurringTransaction.from_account_id, models.RecurringTransaction.to_account_id,
+        ]
+    else:
+        references = [models.Transaction.category_id, models.RecurringTransaction.category_id, models.Budget.category_id]
+    return any(
+        db.query(db.query(column.class_).filter(column == id).exists()).scalar()
+        for column in references
+    )
+
+
+# --- SEEDING ---
+def seed_reference_data(db: Session, account_names, categories):
+    """
+    Inserts the given accounts and (name, type) categories unless an account
+    or category of that name already exists. Existing names are checked
+    against reference_data, which this loads, so a database that is already
+    seeded costs no further queries.
+    """
+    existing_accounts = {row["name"] for row in reference_data.rows("accounts")}
+    existing_categories = {row["name"] for row in reference_data.rows("categories")}
+    account_names = [name for name in account_names if name not in existing_accounts]
+    categories = [(name, type) for name, type in categories if name not in existing_categories]
+    if not account_names and not categories:
+        return
+
+    upsert_insert = _upsert_insert(db)
+    if account_names:
+        db.execute(
+            upsert_insert(models.Account)
+            .values([{"name": name} for name in account_names])
+            .on_conflict_do_nothing(index_elements=[models.Account.name])
+        )
+    if categories:
+        db.execute(
+            upsert_insert(models.Category)
+            .values([{"name": name, "type": type} for name, type in categories])
+            .on_conflict_do_nothing(index_elements=[models.Category.name])
+        )
+    db.commit()
+    # Reloaded on next use, picking up the new rows
+    reference_data.invalidate()
+    data_versions.bump("accounts", "categories")
+
+
 # --- SUMMARY ---
 def get_summary_by_category(
     db: Session,
@@ -196,19 +825,35 @@ def get_summary_by_category(
 ):
     """
     Calculates total transaction amounts per category for a given date range and type.
+    Whole months are read from the monthly_category_totals rollup; only the
+    partial months at either end of the range are summed from raw rows.
     """
-    query = db.query(
-        models.Transaction.category,
-        func.sum(models.Transaction.amount).label("total_amount"),
-    ).filter(models.Transaction.type == type)
-
-    if start_date:
-        query = query.filter(models.Transaction.date >= start_date)
-    if end_date:
-        query = query.filter(models.Transaction.date < end_date + timedelta(days=1))
-
-    summary = query.group_by(models.Transaction.category).all()
-    return {item.category: item.total_amount for item in summary}
+    first_month, last_month, raw_ranges = _split_month_range(start_date, end_date)
+
+    summary = {}
+    if first_month is not _NO_MONTHS:
+        query = db.query(
+            models.MonthlyCategoryTotal.category_id,
+            func.sum(models.MonthlyCategoryTotal.total).label("total_amount"),
+        ).filter(
+            models.MonthlyCategoryTotal.type == type,
+            models.MonthlyCategoryTotal.transaction_count > 0,
+        )
+        query = _filter_months(query, first_month, last_month)
+        for item in query.group_by(models.MonthlyCategoryTotal.category_id).all():
+            summary[item.category_id] = item.total_amount
+
+    for range_start, range_end in raw_ranges:
+        query = db.query(
+            models.Transaction.category_id,
+            func.sum(models.Transaction.amount).label("total_amount"),
+        ).filter(models.Transaction.type == type)
+        query = _filter_transactions(query, range_start, range_end, None)
+        for item in query.group_by(models.Transaction.category_id).all():
+            # Rounded back to the currency scale after adding the two partial sums
+            summary[item.category_id] = round(summary.get(item.category_id, 0.0) + item.total_amount, models.CURRENCY_DECIMALS)
+
+    return {reference_data.name("categories", category_id): total for category_id, total in summary.items()}
 
 def get_summary_by_month(
     db: Session,
@@ -218,44 +863,477 @@ def get_summary_by_month(
 ):
     """
     Calculates total transaction amounts per month for a given date range and type.
+    Whole months are read from the monthly_category_totals rollup; only the
+    partial months at either end of the range are summed from raw rows.
+    """
+    first_month, last_month, raw_ranges = _split_month_range(start_date, end_date)
+
+    summary = {}
+    if first_month is not _NO_MONTHS:
+        query = db.query(
+            models.MonthlyCategoryTotal.year_month.label("month"),
+            func.sum(models.MonthlyCategoryTotal.total).label("total_amount"),
+        ).filter(
+            models.MonthlyCategoryTotal.type == type,
+            models.MonthlyCategoryTotal.transaction_count > 0,
+        )
+        query = _filter_months(query, first_month, last_month)
+        for item in query.group_by(models.MonthlyCategoryTotal.year_month).all():
+            summary[item.month] = item.total_amount
+
+    for range_start, range_end in raw_ranges:
+        query = db.query(
+            # Extract Year and Month from the date as "YYYY-MM"
+            month_bucket(db, models.Transaction.date).label("month"),
+            func.sum(models.Transaction.amount).label("total_amount"),
+        ).filter(models.Transaction.type == type)
+        query = _filter_transactions(query, range_start, range_end, None)
+        for item in query.group_by("month").all():
+            summary[item.month] = round(summary.get(item.month, 0.0) + item.total_amount, models.CURRENCY_DECIMALS)
+
+    return dict(sorted(summary.items()))
+
+# Dimensions get_summary can group by; at most one of them may be a time bucket
+SUMMARY_TIME_BUCKETS = ("day", "week", "month", "quarter", "year")
+SUMMARY_DIMENSIONS = SUMMARY_TIME_BUCKETS + ("category", "account", "type")
+
+def get_summary(
+    db: Session,
+    group_by: List[str],
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    types: Optional[List[str]] = None,
+):
+    """
+    Calculates total transaction amounts and counts grouped by any combination
+    of a time bucket, category, account and type. A transaction's account is
+    the one the money left, or the one it arrived in for income.
+    Returns {"group_by": [...], "columns": {...}}, where columns holds one list
+    per dimension plus "total" and "count", ordered by group.
+    Month, quarter and year buckets read whole months from the
+    monthly_category_totals rollup; day and week buckets, and the partial
+    months at either end of the range, are summed from raw rows.
     """
-    query = db.query(
-        # Extract Year and Month from the date. SQLite uses strftime.
-        func.strftime("%Y-%m", models.Transaction.date).label("month"),
-        func.sum(models.Transaction.amount).label("total_amount"),
-    ).filter(models.Transaction.type == type)
+    bucket = summary_time_bucket(group_by)
 
-    if start_date:
-        query = query.filter(models.Transaction.date >= start_date)
-    if end_date:
-        query = query.filter(models.Transaction.date < end_date + timedelta(days=1))
+    if bucket in ("day", "week"):
+        first_month, last_month, raw_ranges = _NO_MONTHS, None, [(start_date, end_date)]
+    else:
+        first_month, last_month, raw_ranges = _split_month_range(start_date, end_date)
+
+    # Group keys hold the bucket label and the category and account ids in
+    # group_by order, and are mapped to names once everything is added up
+    groups = {}
+
+    def add(key, total, count):
+        if key in groups:
+            previous_total, previous_count = groups[key]
+            # Rounded back to the currency scale after adding the partial sums
+            groups[key] = (round(previous_total + total, models.CURRENCY_DECIMALS), previous_count + count)
+        else:
+            groups[key] = (total, count)
+
+    if first_month is not _NO_MONTHS:
+        rollup = models.MonthlyCategoryTotal
+        columns = {
+            "category": rollup.category_id,
+            "account": rollup.account_id,
+            "type": rollup.type,
+        }
+        if bucket:
+            columns[bucket] = rollup.year_month
+        selected = [columns[dimension] for dimension in group_by]
+        query = db.query(
+            *selected,
+            func.sum(rollup.total).label("total_amount"),
+            func.sum(rollup.transaction_count).label("transaction_count"),
+        ).filter(rollup.transaction_count > 0)
+        if types:
+            query = query.filter(rollup.type.in_(types))
+        query = _filter_months(query, first_month, last_month)
+        for row in query.group_by(*selected).all():
+            if not row.transaction_count:
+                # Ungrouped sums over no rows still return one empty row
+                continue
+            key = list(row[:len(group_by)])
+            if bucket:
+                # Whole months are regrouped into their quarter or year here
+                index = group_by.index(bucket)
+                key[index] = _month_to_bucket(key[index], bucket)
+            add(tuple(key), row.total_amount, row.transaction_count)
+
+    if raw_ranges:
+        columns = {
+            "category": models.Transaction.category_id,
+            "account": func.coalesce(models.Transaction.from_account_id, models.Transaction.to_account_id, models.NO_ACCOUNT_ID),
+            "type": models.Transaction.type,
+        }
+        if bucket:
+            columns[bucket] = time_bucket(db, bucket, models.Transaction.date)
+        selected = [columns[dimension] for dimension in group_by]
+        for range_start, range_end in raw_ranges:
+            query = db.query(
+                *selected,
+                func.sum(models.Transaction.amount).label("total_amount"),
+                func.count().label("transaction_count"),
+            # Undated rows have no bucket, and never reach the rollup either
+            ).filter(models.Transaction.date.isnot(None))
+            if types:
+                query = query.filter(models.Transaction.type.in_(types))
+            query = _filter_transactions(query, range_start, range_end, None)
+            for row in query.group_by(*selected).all():
+                if row.transaction_count:
+                    add(tuple(row[:len(group_by)]), row.total_amount, row.transaction_count)
+
+    return summary_columns(group_by, groups)
+
+def summary_time_bucket(group_by: List[str]) -> Optional[str]:
+    """
+    Validates the dimensions of a summary and returns its time bucket, or
+    None when it is not grouped by time.
+    Raises ValueError for unknown or repeated dimensions, or more than one
+    time bucket.
+    """
+    unknown = [dimension for dimension in group_by if dimension not in SUMMARY_DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Cannot group by {', '.join(unknown)}; expected any of {', '.join(SUMMARY_DIMENSIONS)}")
+    if len(set(group_by)) != len(group_by):
+        raise ValueError("Each group_by dimension may only be given once")
+    buckets = [dimension for dimension in group_by if dimension in SUMMARY_TIME_BUCKETS]
+    if len(buckets) > 1:
+        raise ValueError(f"Only one time bucket can be grouped by, got {', '.join(buckets)}")
+    return buckets[0] if buckets else None
+
+def summary_columns(group_by: List[str], groups):
+    """
+    Builds the columnar summary response from {key: (total, count)}, where
+    each key holds the bucket label, category id, account id and type of a
+    group in group_by order.
+    """
+    labelled = []
+    for key, (total, count) in groups.items():
+        labels = tuple(_summary_label(dimension, value) for dimension, value in zip(group_by, key))
+        labelled.append((labels, total, count))
+    # No account (None) sorts ahead of the named ones
+    labelled.sort(key=lambda group: tuple((label is not None, label or "") for label in group[0]))
+
+    columns = {dimension: [labels[index] for labels, _, _ in labelled] for index, dimension in enumerate(group_by)}
+    columns["total"] = [total for _, total, _ in labelled]
+    columns["count"] = [count for _, _, count in labelled]
+    return {"group_by": list(group_by), "columns": columns}
+
+def split_group_by(group_by: str) -> List[str]:
+    """
+    Splits a comma-separated group_by parameter into its dimensions.
+    """
+    return [dimension.strip() for dimension in group_by.split(",") if dimension.strip()]
 
-    summary = query.group_by("month").order_by("month").all()
-    return {item.month: item.total_amount for item in summary}
+def _month_to_bucket(year_month: str, bucket: str) -> str:
+    """
+    Maps a "YYYY-MM" month to the label of the month, quarter or year bucket
+    that contains it, matching time_bucket.
+    """
+    if bucket == "year":
+        return year_month[:4]
+    if bucket == "quarter":
+        return f"{year_month[:4]}-Q{(int(year_month[5:7]) + 2) // 3}"
+    return year_month
+
+def _summary_label(dimension: str, value):
+    if dimension == "category":
+        return reference_data.name("categories", value)
+    if dimension == "account":
+        return None if value == models.NO_ACCOUNT_ID else reference_data.name("accounts", value)
+    return value
+
+def time_bucket(db: Session, bucket: str, column):
+    """
+    Returns a SQL expression labelling a date column with its day
+    ("YYYY-MM-DD"), week ("YYYY-MM-DD" of its Monday), month ("YYYY-MM"),
+    quarter ("YYYY-Qn") or year ("YYYY") in the dialect of the session's
+    database.
+    """
+    if bucket == "day":
+        return day_bucket(db, column)
+    if bucket == "month":
+        return month_bucket(db, column)
+    if db.get_bind().dialect.name == "postgresql":
+        if bucket == "week":
+            return func.to_char(func.date_trunc("week", column), "YYYY-MM-DD")
+        return func.to_char(column, 'YYYY-"Q"Q' if bucket == "quarter" else "YYYY")
+    if bucket == "week":
+        # The next Sunday (or the day itself), then back to its Monday
+        return func.date(column, "weekday 0", "-6 days")
+    if bucket == "quarter":
+        quarter = (cast(func.strftime("%m", column), Integer) + 2) // 3
+        return func.strftime("%Y-Q", column).op("||")(cast(quarter, String))
+    return func.strftime("%Y", column)
+
+def month_bucket(db: Session, column):
+    """
+    Returns a SQL expression formatting a date column as "YYYY-MM" in the
+    dialect of the session's database.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return func.to_char(column, "YYYY-MM")
+    return func.strftime("%Y-%m", column)
+
+def day_bucket(db: Session, column):
+    """
+    Returns a SQL expression formatting a date column as "YYYY-MM-DD" in the
+    dialect of the session's database.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return func.to_char(column, "YYYY-MM-DD")
+    return func.strftime("%Y-%m-%d", column)
+
+# Marks a date range that contains no whole month
+_NO_MONTHS = object()
+
+def _split_month_range(start_date: Optional[date], end_date: Optional[date]):
+    """
+    Splits an inclusive date range into the whole months it covers and the
+    partial months at its edges.
+    Returns (first_month, last_month, raw_ranges): first_month/last_month are
+    inclusive "YYYY-MM" bounds of the whole months (None when unbounded, or
+    _NO_MONTHS when there are none), and raw_ranges lists the (start, end)
+    date ranges that must be read from raw transactions.
+    """
+    if start_date and end_date and start_date > end_date:
+        return _NO_MONTHS, None, []
+
+    first_full = start_date
+    if start_date and start_date.day != 1:
+        first_full = _next_month_start(start_date)
+
+    last_full_end = end_date
+    if end_date and _next_month_start(end_date) - timedelta(days=1) != end_date:
+        last_full_end = end_date.replace(day=1) - timedelta(days=1)
+
+    if first_full and last_full_end and first_full > last_full_end:
+        # The range sits inside a single month, or spans two partial months
+        if start_date.month == end_date.month and start_date.year == end_date.year:
+            return _NO_MONTHS, None, [(start_date, end_date)]
+        return _NO_MONTHS, None, [
+            (start_date, first_full - timedelta(days=1)),
+            (end_date.replace(day=1), end_date),
+        ]
+
+    raw_ranges = []
+    if start_date and first_full != start_date:
+        raw_ranges.append((start_date, first_full - timedelta(days=1)))
+    if end_date and last_full_end != end_date:
+        raw_ranges.append((end_date.replace(day=1), end_date))
+
+    first_month = first_full.strftime("%Y-%m") if first_full else None
+    last_month = last_full_end.strftime("%Y-%m") if last_full_end else None
+    return first_month, last_month, raw_ranges
+
+def _next_month_start(day: date) -> date:
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+def _filter_months(query, first_month: Optional[str], last_month: Optional[str]):
+    if first_month:
+        query = query.filter(models.MonthlyCategoryTotal.year_month >= first_month)
+    if last_month:
+        query = query.filter(models.MonthlyCategoryTotal.year_month <= last_month)
+    return query
+
+def _monthly_total_key(transaction_date, type: str, category_id: int, from_account_id: Optional[int], to_account_id: Optional[int]):
+    """
+    Returns the monthly_category_totals key a transaction is counted under.
+    """
+    return (type, transaction_date.strftime("%Y-%m"), category_id, from_account_id or to_account_id or models.NO_ACCOUNT_ID)
+
+def _add_to_monthly_total(db: Session, key, delta: float, count_delta: int):
+    """
+    Atomically adds delta (over count_delta transactions) to a
+    monthly_category_totals row, creating it if it does not exist yet.
+    The caller commits.
+    """
+    type, year_month, category_id, account_id = key
+    insert_stmt = _upsert_insert(db)(models.MonthlyCategoryTotal).values(
+        type=type, year_month=year_month, category_id=category_id, account_id=account_id,
+        total=delta, transaction_count=count_delta,
+    )
+    db.execute(insert_stmt.on_conflict_do_update(
+        index_elements=[
+            models.MonthlyCategoryTotal.type,
+            models.MonthlyCategoryTotal.year_month,
+            models.MonthlyCategoryTotal.category_id,
+            models.MonthlyCategoryTotal.account_id,
+        ],
+        set_={
+            "total": models.MonthlyCategoryTotal.total + insert_stmt.excluded.total,
+            "transaction_count": models.MonthlyCategoryTotal.transaction_count + insert_stmt.excluded.transaction_count,
+        },
+    ))
+
+def _apply_to_monthly_totals(db: Session, db_transaction: models.Transaction, sign: int = 1):
+    """
+    Adds (sign=1) or backs out (sign=-1) a transaction's amount in the
+    monthly_category_totals rollup. The caller commits.
+    Undated transactions have no month and are left out of the rollup.
+    """
+    if db_transaction.date is None:
+        return
+    key = _monthly_total_key(
+        db_transaction.date, db_transaction.type, db_transaction.category_id,
+        db_transaction.from_account_id, db_transaction.to_account_id,
+    )
+    _add_to_monthly_total(db, key, sign * db_transaction.amount, sign)
+
+def rebuild_monthly_totals(db: Session):
+    """
+    Recomputes the monthly_category_totals rollup from the full ledger.
+    """
+    account_id = func.coalesce(models.Transaction.from_account_id, models.Transaction.to_account_id, models.NO_ACCOUNT_ID)
+    month = month_bucket(db, models.Transaction.date)
+    rows = db.query(
+        models.Transaction.type,
+        month.label("year_month"),
+        models.Transaction.category_id,
+        account_id.label("account_id"),
+        func.sum(models.Transaction.amount).label("total"),
+        func.count().label("transaction_count"),
+    ).filter(
+        # Undated transactions have no month to be counted under
+        models.Transaction.date.isnot(None),
+    ).group_by(models.Transaction.type, month, models.Transaction.category_id, account_id).all()
+
+    db.query(models.MonthlyCategoryTotal).delete()
+    if rows:
+        db.execute(insert(models.MonthlyCategoryTotal), [row._asdict() for row in rows])
+    db.commit()
+    data_versions.bump("transactions")
 
 
 # --- NET WORTH ---
+def get_net_worth(db: Session):
+    """
+    Returns the current total net worth from the maintained running total.
+    """
+    total = db.get(models.NetWorthTotal, NET_WORTH_TOTAL_ID)
+    return total.value if total else 0.0
+
 def record_net_worth_snapshot(db: Session):
     """
-    Calculates the current total net worth and saves it as a snapshot for today.
+    Saves the current total net worth as a snapshot for today.
     If a snapshot for today already exists, it updates it.
     """
-    balances = get_account_balances(db=db)
-    total_net_worth = sum(balances.values())
-    today = datetime.now(timezone.utc).date()   # Use timezone-aware date
+    total_net_worth = get_net_worth(db)
+    now = datetime.now(timezone.utc)   # Use timezone-aware date
+    start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    # One row per day at midnight, like the rows written by
+    # _refresh_net_worth_history. A single upsert stays correct when a
+    # transaction write rewrites today's row at the same time.
+    insert_stmt = _upsert_insert(db)(models.NetWorthHistory).values(date=start_of_day, value=total_net_worth)
+    db.execute(insert_stmt.on_conflict_do_update(
+        index_elements=[models.NetWorthHistory.date],
+        set_={"value": insert_stmt.excluded.value},
+    ))
+
+    db.commit()
+    data_versions.bump("net_worth_history")
 
-    # Check if an entry for today already exists
-    existing_snapshot = db.query(models.NetWorthHistory).filter(func.date(models.NetWorthHistory.date) == today).first()
+def rebuild_net_worth_history(db: Session, since: Optional[date] = None):
+    """
+    Recomputes the daily net worth history from the ledger, one row per day
+    up to today. With since, only the days from since onward are rewritten;
+    otherwise the whole history is rebuilt from the first transaction.
+    """
+    _refresh_net_worth_history(db, since)
+    db.commit()
+    data_versions.bump("net_worth_history")
 
-    if existing_snapshot:
-        # Update today's existing snapshot
-        existing_snapshot.value = total_net_worth
+# Days read from the ledger and history rows written per round trip
+NET_WORTH_HISTORY_CHUNK_SIZE = 1000
+
+def _net_worth_change():
+    """
+    A transaction's effect on net worth: money arriving in an account adds,
+    money leaving one subtracts, so transfers net to zero.
+    """
+    # Arithmetic between money columns is typed as a plain integer, so the
+    # result is marked as money again to be read back as a decimal amount
+    return type_coerce(
+        case((models.Transaction.to_account_id.isnot(None), models.Transaction.amount), else_=0)
+        - case((models.Transaction.from_account_id.isnot(None), models.Transaction.amount), else_=0),
+        models.Money,
+    )
+
+def _refresh_net_worth_history(db: Session, since: Optional[date] = None):
+    """
+    Rewrites the net worth history from since (or from the beginning) through
+    today. Used after transaction writes with the earliest date they touched.
+    The caller commits.
+    """
+    today = datetime.now(timezone.utc).date()
+    if since is not None and since > today:
+        return
+    db.flush()
+
+    changes = db.query(models.Transaction).filter(models.Transaction.date.isnot(None))
+    history = db.query(models.NetWorthHistory)
+    if since is None:
+        opening = 0.0
     else:
-        # Create a new snapshot for today
-        new_snapshot = models.NetWorthHistory(date=datetime.now(timezone.utc), value=total_net_worth)
-        db.add(new_snapshot)
+        # Start from the running total and undo everything on or after since,
+        # so only the rewritten range of the ledger is read
+        start_of_since = datetime.combine(since, time.min, tzinfo=timezone.utc)
+        changes = changes.filter(models.Transaction.date >= start_of_since)
+        history = history.filter(models.NetWorthHistory.date >= start_of_since)
+        opening = get_net_worth(db) - (
+            changes.with_entities(func.sum(_net_worth_change())).scalar() or 0.0
+        )
 
-    db.commit()
+    day = day_bucket(db, models.Transaction.date)
+    daily_changes = (
+        (date.fromisoformat(change_day), change)
+        for change_day, change in changes.with_entities(day, func.sum(_net_worth_change()))
+        .group_by(day)
+        .order_by(day)
+        .yield_per(NET_WORTH_HISTORY_CHUNK_SIZE)
+    )
+
+    history.delete(synchronize_session=False)
+    series = _daily_net_worth(daily_changes, since, opening, today)
+    # A concurrent writer (e.g. the scheduled jobs) may have written the
+    # same days after the delete above, so existing rows are overwritten
+    insert_stmt = _upsert_insert(db)(models.NetWorthHistory)
+    upsert = insert_stmt.on_conflict_do_update(
+        index_elements=[models.NetWorthHistory.date],
+        set_={"value": insert_stmt.excluded.value},
+    )
+    while chunk := list(itertools.islice(series, NET_WORTH_HISTORY_CHUNK_SIZE)):
+        db.execute(upsert, [
+            {"date": datetime.combine(day, time.min, tzinfo=timezone.utc), "value": value}
+            for day, value in chunk
+        ])
+
+def _daily_net_worth(daily_changes, start: Optional[date], opening: float, end: date):
+    """
+    Turns (day, change) pairs in date order into a running (day, net worth)
+    series with one entry per day from start (or the first change) to end.
+    Days without transactions carry the previous value over.
+    """
+    value = opening
+    day = start
+    for change_day, change in daily_changes:
+        if change_day > end:
+            break
+        if day is None:
+            day = change_day
+        while day < change_day:
+            yield day, value
+            day += timedelta(days=1)
+        value += change
+    if day is None:
+        return
+    while day <= end:
+        yield day, value
+        day += timedelta(days=1)
 
 def get_net_worth_history(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None):
     """
@@ -270,6 +1348,19 @@ def get_net_worth_history(db: Session, start_date: Optional[date] = None, end_da
     return query.order_by(models.NetWorthHistory.date).all()
 
 
+# --- DASHBOARD ---
+def get_dashboard(db: Session):
+    """
+    Gathers everything the dashboard shows. All three reads run in the same
+    session and database transaction, so they see one consistent snapshot.
+    """
+    return {
+        "balances": get_account_balances(db),
+        "net_worth_history": get_net_worth_history(db),
+        "budget_status": get_budgets_status(db),
+    }
+
+
 # --- RECURRING TRANSACTIONS ---
 def get_recurring_transactions(db: Session):
     return db.query(models.RecurringTransaction).order_by(models.RecurringTransaction.day_of_month).all()
@@ -281,9 +1372,11 @@ def create_recurring_transaction(db: Session, rec_transaction: schemas.Recurring
     elif rec_data['type'] == 'Income':
         rec_data['from_account'] = None
     
-    db_rec_transaction = models.RecurringTransaction(**rec_data)
+    db_rec_transaction = models.RecurringTransaction(**_transaction_values(db, rec_data))
     db.add(db_rec_transaction)
     db.commit()
+    _reference_data_committed(db)
+    data_versions.bump("recurring_transactions")
     db.refresh(db_rec_transaction)
     return db_rec_transaction
 
@@ -296,9 +1389,11 @@ def update_recurring_transaction(db: Session, rec_transaction_id: int, rec_trans
         elif rec_data['type'] == 'Income':
             rec_data['from_account'] = None
 
-        for key, value in rec_data.items():
+        for key, value in _transaction_values(db, rec_data).items():
             setattr(db_rec_transaction, key, value)
         db.commit()
+        _reference_data_committed(db)
+        data_versions.bump("recurring_transactions")
         db.refresh(db_rec_transaction)
     return db_rec_transaction
 
@@ -307,66 +1402,135 @@ def delete_recurring_transaction(db: Session, rec_transaction_id: int):
     if db_rec_transaction:
         db.delete(db_rec_transaction)
         db.commit()
+        data_versions.bump("recurring_transactions")
     return db_rec_transaction
 
-def process_recurring_transactions(db: Session):
+def process_recurring_transactions(db: Session, today: Optional[date] = None):
     """
-    Checks all recurring transaction rules and creates transactions if they are due.
+    Creates the transactions of every recurring rule that fell due since the
+    rule was last processed, catching up on any missed months.
+    Each rule's last_processed_date is the date of its latest generated
+    transaction. It is advanced with a compare-and-set, so concurrent runs
+    never generate the same month twice. Everything is inserted in one batch
+    and committed together. Returns the number of transactions created.
     """
-    today = datetime.now(timezone.utc).date()
-    all_rules = db.query(models.RecurringTransaction).all()
-
-    for rule in all_rules:
-        # Check if the rule's day has passed in the current month
-        if today.day >= rule.day_of_month:
-            start_of_month = today.replace(day=1)
-
-            transaction_exists_this_month = db.query(models.Transaction).filter(
-                models.Transaction.category == rule.category,
-                models.Transaction.type == rule.type,
-                func.date(models.Transaction.date) >= start_of_month
-            ).first()
-
-            if not transaction_exists_this_month:
-                print(f"Processing recurring transaction as it was not found this month: {rule.description}")
-                
-                # Create the new transaction. We'll set its date to be the rule's day for this month.
-                transaction_date = today.replace(day=rule.day_of_month)
-
-                new_transaction = schemas.TransactionCreate(
-                    type=rule.type,
-                    amount=rule.amount,
-                    category=rule.category,
-                    description=f"(Recurring) {rule.description}", # Use the special description
-                    from_account=rule.from_account,
-                    to_account=rule.to_account
-                )
-
-                db_transaction = models.Transaction(**new_transaction.model_dump(), date=transaction_date)
-                
-                db.add(db_transaction)
-                db.commit()
+    today = today or datetime.now(timezone.utc).date()
+    rules = db.query(models.RecurringTransaction).all()
+    legacy_this_month = None
+    claimed_any = False
+    new_rows = []
+    deltas = _LedgerDeltas()
+
+    for rule in rules:
+        last_processed = rule.last_processed_date
+        due_dates = _recurring_due_dates(rule.day_of_month, last_processed.date() if last_processed else None, today)
+        if not due_dates:
+            continue
+
+        # Rules processed before the watermark was kept may already have this
+        # month's transaction, recognisable by its description
+        skip_existing = False
+        if last_processed is None:
+            if legacy_this_month is None:
+                legacy_this_month = _recurring_transactions_this_month(db, today)
+            skip_existing = (f"(Recurring) {rule.description}", rule.type, rule.category_id) in legacy_this_month
+
+        # Claim the months; another run that got there first leaves nothing to do
+        watermark = datetime.combine(due_dates[-1], time.min, tzinfo=timezone.utc)
+        previous = (
+            models.RecurringTransaction.last_processed_date.is_(None)
+            if last_processed is None
+            else models.RecurringTransaction.last_processed_date == last_processed
+        )
+        claimed = db.query(models.RecurringTransaction).filter(
+            models.RecurringTransaction.id == rule.id, previous
+        ).update({"last_processed_date": watermark}, synchronize_session=False)
+        claimed_any = claimed_any or bool(claimed)
+        if not claimed or skip_existing:
+            continue
+
+        print(f"Processing recurring transaction for {len(due_dates)} month(s): {rule.description}")
+        for due_date in due_dates:
+            values = {
+                "date": datetime.combine(due_date, time.min, tzinfo=timezone.utc),
+                "type": rule.type,
+                "amount": rule.amount,
+                "category_id": rule.category_id,
+                "description": f"(Recurring) {rule.description}",   # Use the special description
+                "from_account_id": rule.from_account_id,
+                "to_account_id": rule.to_account_id,
+            }
+            new_rows.append(values)
+            deltas.add(values)
+
+    if new_rows:
+        db.execute(insert(models.Transaction), new_rows)
+        deltas.apply(db)
+    db.commit()
+
+    if claimed_any:
+        data_versions.bump("recurring_transactions")
+    if new_rows:
+        _transactions_changed(db, appended_only=True)
+    return len(new_rows)
+
+def _recurring_due_dates(day_of_month: int, last_processed: Optional[date], today: date):
+    """
+    Returns the dates a rule fell due on, from the month after last_processed
+    (or the current month for a rule never processed) through today.
+    In shorter months the rule falls due on the last day of the month.
+    """
+    month_start = today.replace(day=1) if last_processed is None else _next_month_start(last_processed)
+
+    due_dates = []
+    while month_start <= today:
+        days_in_month = calendar.monthrange(month_start.year, month_start.month)[1]
+        due_date = month_start.replace(day=min(day_of_month, days_in_month))
+        if due_date > today:
+            break
+        due_dates.append(due_date)
+        month_start = _next_month_start(month_start)
+    return due_dates
+
+def _recurring_transactions_this_month(db: Session, today: date):
+    """
+    Returns (description, type, category_id) of the recurring transactions
+    already created this month.
+    """
+    start_of_month = datetime.combine(today.replace(day=1), time.min, tzinfo=timezone.utc)
+    rows = db.query(
+        models.Transaction.description, models.Transaction.type, models.Transaction.category_id
+    ).filter(
+        models.Transaction.date >= start_of_month,
+        models.Transaction.description.like("(Recurring) %"),
+    ).all()
+    return {tuple(row) for row in rows}
 
 
 # --- BUDGETS ---
 def get_budgets(db: Session):
-    return db.query(models.Budget).order_by(models.Budget.category_name).all()
+    return db.query(models.Budget).join(
+        models.Category, models.Category.id == models.Budget.category_id
+    ).order_by(models.Category.name).all()
 
 def create_or_update_budget(db: Session, budget: schemas.BudgetCreate):
     """
     Creates a new budget or updates an existing one for the same category.
     """
-    db_budget = db.query(models.Budget).filter(models.Budget.category_name == budget.category_name).first()
+    category_id = _category_id(db, budget.category_name, "Expense")
+    db_budget = db.query(models.Budget).filter(models.Budget.category_id == category_id).first()
 
     if db_budget:
         # Update existing budget
         db_budget.amount = budget.amount
     else:
         # Create new budget
-        db_budget = models.Budget(**budget.model_dump())
+        db_budget = models.Budget(category_id=category_id, amount=budget.amount)
         db.add(db_budget)
 
     db.commit()
+    _reference_data_committed(db)
+    data_versions.bump("budgets")
     db.refresh(db_budget)
     return db_budget
 
@@ -375,6 +1539,7 @@ def delete_budget(db: Session, budget_id: int):
     if db_budget:
         db.delete(db_budget)
         db.commit()
+        data_versions.bump("budgets")
     return db_budget
 
 def get_budgets_status(db: Session):
@@ -385,20 +1550,26 @@ def get_budgets_status(db: Session):
     today = datetime.now(timezone.utc).date()
     start_of_month = today.replace(day=1)
 
-    all_budgets = db.query(models.Budget).all()
-    budget_statuses = []
-
-    for budget in all_budgets:
-        # Calculate total spending for this budget's category in current month
-        total_spent_query = db.query(func.sum(models.Transaction.amount)).filter(
-            models.Transaction.type == 'Expense',
-            models.Transaction.category == budget.category_name,
-            func.date(models.Transaction.date) >= start_of_month,
-            func.date(models.Transaction.date) <= today
-        )
-        total_spent = total_spent_query.scalar() or 0.0
+    # Spending per category this month, as a plain date range on the raw
+    # column so the (category, type, date) index can be used
+    spent_by_category = db.query(
+        models.Transaction.category_id.label("category_id"),
+        func.sum(models.Transaction.amount).label("total_spent"),
+    ).filter(
+        models.Transaction.type == 'Expense',
+        models.Transaction.date >= start_of_month,
+        models.Transaction.date < today + timedelta(days=1),
+    ).group_by(models.Transaction.category_id).subquery()
+
+    # The difference is taken in the database so it stays exact in minor units
+    total_spent = func.coalesce(spent_by_category.c.total_spent, 0)
+    remaining = type_coerce(models.Budget.amount - total_spent, models.Money)
+    rows = db.query(models.Budget, total_spent, remaining).outerjoin(
+        spent_by_category, spent_by_category.c.category_id == models.Budget.category_id
+    ).all()
 
-        remaining = budget.amount - total_spent
+    budget_statuses = []
+    for budget, total_spent, remaining in rows:
 
         status = schemas.BudgetStatus(
             category_name=budget.category_name,
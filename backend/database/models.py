@@ -1,6 +1,36 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from decimal import Decimal, ROUND_HALF_UP
+from sqlalchemy import BigInteger, Column, DDL, Integer, String, DateTime, ForeignKey, Index, event
 from sqlalchemy.sql import func
+from sqlalchemy.types import TypeDecorator
 from .session import Base
+from .cache import reference_data
+
+# Money is stored in minor units (cents), CURRENCY_DECIMALS digits after the point
+CURRENCY_DECIMALS = 2
+MINOR_UNITS = 10 ** CURRENCY_DECIMALS
+
+class Money(TypeDecorator):
+    """
+    An amount of money stored as a whole number of minor units, so sums and
+    comparisons in the database are exact integer arithmetic. Python code
+    and the API keep working with decimal amounts: values are rounded to the
+    currency scale on the way in and converted back on the way out,
+    including the results of SUM() and other expressions over the column.
+    """
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        # str() keeps the decimal digits the float was written with
+        return int(Decimal(str(value)).scaleb(CURRENCY_DECIMALS).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        # PostgreSQL returns SUM(bigint) as a Decimal; the value is still whole
+        return int(value) / MINOR_UNITS
 
 class Transaction(Base):
     __tablename__ = "transactions"
@@ -8,15 +38,74 @@ class Transaction(Base):
     id = Column(Integer, primary_key=True, index=True)
     date = Column(DateTime(timezone=True), server_default=func.now())
     type = Column(String, nullable=False)    # Expenses, Income, Transfer
-    amount = Column(Float, nullable=False)
-    category = Column(String, nullable=False)
+    amount = Column(Money, nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
     description = Column(String)
 
     # For transfers, money moves from one acc to another
     # For expenses, money moves from one acc to external (to_account = NULL)
     # For income, money moves from external to one acc   (from_account = NULL)
-    from_account = Column(String)
-    to_account = Column(String)
+    from_account_id = Column(Integer, ForeignKey("accounts.id"))
+    to_account_id = Column(Integer, ForeignKey("accounts.id"))
+
+    __table_args__ = (
+        # Date-ordered listing with no type filter
+        Index("ix_transactions_date", "date"),
+        # Listing and summaries filtered by type and a date range
+        Index("ix_transactions_type_date", "type", "date"),
+        # Budget status and recurring checks look up one category of one type
+        Index("ix_transactions_category_type_date", "category_id", "type", "date"),
+        # Balance aggregation and account usage checks; amount is included so
+        # the sums can be answered from the index alone
+        Index("ix_transactions_from_account_amount", "from_account_id", "amount"),
+        Index("ix_transactions_to_account_amount", "to_account_id", "amount"),
+    )
+
+    # Names for the API, resolved through the in-process id <-> name map
+    @property
+    def category(self):
+        return reference_data.name("categories", self.category_id)
+
+    @property
+    def from_account(self):
+        return reference_data.name("accounts", self.from_account_id)
+
+    @property
+    def to_account(self):
+        return reference_data.name("accounts", self.to_account_id)
+
+# Full-text search over transaction descriptions. SQLite keeps an FTS5 index
+# of the descriptions in step with the table through triggers; PostgreSQL
+# uses a GIN index over the description's tsvector. Neither is part of the
+# models, so both are created here for new databases and by a migration for
+# existing ones.
+TRANSACTION_SEARCH_TABLE = "transactions_fts"
+TRANSACTION_SEARCH_INDEX = "ix_transactions_description_search"
+# The 'simple' configuration lowercases words without stemming, like FTS5
+TRANSACTION_SEARCH_TSVECTOR = "to_tsvector('simple', coalesce(description, ''))"
+
+TRANSACTION_SEARCH_DDL = {
+    "sqlite": [
+        f"CREATE VIRTUAL TABLE {TRANSACTION_SEARCH_TABLE} USING fts5("
+        "description, content='transactions', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER {TRANSACTION_SEARCH_TABLE}_insert AFTER INSERT ON transactions BEGIN "
+        f"INSERT INTO {TRANSACTION_SEARCH_TABLE}(rowid, description) VALUES (new.id, new.description); END",
+        f"CREATE TRIGGER {TRANSACTION_SEARCH_TABLE}_delete AFTER DELETE ON transactions BEGIN "
+        f"INSERT INTO {TRANSACTION_SEARCH_TABLE}({TRANSACTION_SEARCH_TABLE}, rowid, description) "
+        "VALUES ('delete', old.id, old.description); END",
+        f"CREATE TRIGGER {TRANSACTION_SEARCH_TABLE}_update AFTER UPDATE OF description ON transactions BEGIN "
+        f"INSERT INTO {TRANSACTION_SEARCH_TABLE}({TRANSACTION_SEARCH_TABLE}, rowid, description) "
+        "VALUES ('delete', old.id, old.description); "
+        f"INSERT INTO {TRANSACTION_SEARCH_TABLE}(rowid, description) VALUES (new.id, new.description); END",
+    ],
+    "postgresql": [
+        f"CREATE INDEX {TRANSACTION_SEARCH_INDEX} ON transactions USING gin ({TRANSACTION_SEARCH_TSVECTOR})",
+    ],
+}
+
+for dialect, statements in TRANSACTION_SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(Transaction.__table__, "after_create", DDL(statement).execute_if(dialect=dialect))
 
 class Category(Base):
     __tablename__ = "categories"
@@ -36,7 +125,7 @@ class NetWorthHistory(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     date = Column(DateTime(timezone=True), unique=True, index=True, nullable=False)
-    value = Column(Float, nullable=False)
+    value = Column(Money, nullable=False)
 
 class RecurringTransaction(Base):
     __tablename__ = "recurring_transactions"
@@ -46,18 +135,67 @@ class RecurringTransaction(Base):
 
     # We store all the transaction details needed to create the real transaction
     type = Column(String, nullable=False)
-    amount = Column(Float, nullable=False)
-    category = Column(String, nullable=False)
+    amount = Column(Money, nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
     description = Column(String, nullable=False)
-    from_account = Column(String)
-    to_account = Column(String)
+    from_account_id = Column(Integer, ForeignKey("accounts.id"))
+    to_account_id = Column(Integer, ForeignKey("accounts.id"))
 
     # Track when this rule was last processed to prevent duplicates
     last_processed_date = Column(DateTime(timezone=True), nullable=True)
 
+    @property
+    def category(self):
+        return reference_data.name("categories", self.category_id)
+
+    @property
+    def from_account(self):
+        return reference_data.name("accounts", self.from_account_id)
+
+    @property
+    def to_account(self):
+        return reference_data.name("accounts", self.to_account_id)
+
 class Budget(Base):
     __tablename__ = "budgets"
 
     id = Column(Integer, primary_key=True, index=True)
-    category_name = Column(String, unique=True, nullable=False)
-    amount = Column(Float, nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id"), unique=True, nullable=False)
+    amount = Column(Money, nullable=False)
+
+    @property
+    def category_name(self):
+        return reference_data.name("categories", self.category_id)
+
+class AccountBalance(Base):
+    __tablename__ = "account_balances"
+
+    # Running balance per account, kept in step with every transaction write
+    account_id = Column(Integer, ForeignKey("accounts.id"), primary_key=True)
+    balance = Column(Money, nullable=False, default=0.0)
+
+class NetWorthTotal(Base):
+    __tablename__ = "net_worth_total"
+
+    # A single row (id = 1) holding the sum of all account balances, kept in
+    # step with every transaction write so snapshots never scan the ledger
+    id = Column(Integer, primary_key=True)
+    value = Column(Money, nullable=False, default=0.0)
+
+# Stands in for a missing account in the monthly_category_totals key
+NO_ACCOUNT_ID = 0
+
+class MonthlyCategoryTotal(Base):
+    __tablename__ = "monthly_category_totals"
+
+    # Pre-aggregated transaction totals, kept in step with every transaction
+    # write. type leads the key since every summary filters on it.
+    type = Column(String, primary_key=True)
+    year_month = Column(String, primary_key=True)   # "YYYY-MM"
+    category_id = Column(Integer, primary_key=True)
+    # The account money leaves from (Expense, Transfer) or arrives in (Income),
+    # or NO_ACCOUNT_ID for transactions without one
+    account_id = Column(Integer, primary_key=True, default=NO_ACCOUNT_ID)
+    total = Column(Money, nullable=False, default=0.0)
+    # Rows whose transactions were all edited away drop to zero and are ignored
+    transaction_count = Column(Integer, nullable=False, default=0)
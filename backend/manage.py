@@ -0,0 +1,152 @@
+"""
+Maintenance commands for the financial tracker database.
+
+Run from the backend directory, e.g.:
+    python manage.py verify-balances
+    python manage.py rebuild-balances
+    python manage.py rebuild-monthly-totals
+    python manage.py rebuild-net-worth-history [--since YYYY-MM-DD]
+    python manage.py benchmark-analytics [--repeat N]
+"""
+import argparse
+import sys
+import time
+from datetime import date
+
+from database import crud
+from database.session import SessionLocal
+
+
+def verify_balances(args):
+    """
+    Recomputes account balances from the ledger and reports any drift
+    without touching the stored values.
+    """
+    return _report_balances(fix=False)
+
+def rebuild_balances(args):
+    """
+    Recomputes account balances from the ledger and rewrites the stored values.
+    """
+    return _report_balances(fix=True)
+
+def rebuild_monthly_totals(args):
+    """
+    Recomputes the monthly_category_totals rollup from the ledger.
+    """
+    db = SessionLocal()
+    try:
+        crud.rebuild_monthly_totals(db)
+    finally:
+        db.close()
+    print("Rebuilt monthly category totals.")
+    return 0
+
+def rebuild_net_worth_history(args):
+    """
+    Recomputes the daily net worth history from the ledger, either entirely
+    or from --since onward.
+    """
+    db = SessionLocal()
+    try:
+        crud.rebuild_net_worth_history(db, since=args.since)
+    finally:
+        db.close()
+    print(f"Rebuilt net worth history{f' from {args.since}' if args.since else ''}.")
+    return 0
+
+def benchmark_analytics(args):
+    """
+    Times the reporting queries through SQL and through the analytics engine
+    on the current database, and checks that both return the same results.
+    """
+    from database.analytics import AnalyticsEngine
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        engine = AnalyticsEngine()
+        engine.get_account_balances(db)
+        print(f"Loaded {engine.stats()['rows']} transactions into the analytics engine in {_elapsed_ms(started):.1f} ms")
+
+        cases = [
+            ("summary by category", lambda reports: reports.get_summary_by_category(db)),
+            ("summary by month", lambda reports: reports.get_summary_by_month(db)),
+            ("summary by month, category, type", lambda reports: reports.get_summary(db, ["month", "category", "type"])),
+            ("summary by week, account", lambda reports: reports.get_summary(db, ["week", "account"])),
+            ("summary by day", lambda reports: reports.get_summary(db, ["day"], types=["Expense", "Income"])),
+            ("budget status", lambda reports: [status.model_dump() for status in reports.get_budgets_status(db)]),
+        ]
+        balances = [
+            ("account balances", lambda: crud.compute_account_balances(db), lambda: engine.get_account_balances(db)),
+        ]
+        runs = [(name, lambda query=query: query(crud), lambda query=query: query(engine)) for name, query in cases]
+
+        mismatches = 0
+        print(f"{'query':<36}{'sql ms':>10}{'engine ms':>12}{'speedup':>10}")
+        for name, sql, analytics in runs + balances:
+            sql_ms, sql_result = _best_of(sql, args.repeat)
+            engine_ms, engine_result = _best_of(analytics, args.repeat)
+            match = sql_result == engine_result
+            mismatches += not match
+            print(f"{name:<36}{sql_ms:>10.2f}{engine_ms:>12.2f}{sql_ms / max(engine_ms, 1e-9):>9.1f}x{'' if match else '  MISMATCH'}")
+    finally:
+        db.close()
+
+    if mismatches:
+        print(f"{mismatches} query(s) returned different results from SQL and the analytics engine.")
+        return 1
+    return 0
+
+def _best_of(run, repeat: int):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = run()
+        elapsed = _elapsed_ms(started)
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def _elapsed_ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
+
+def _report_balances(fix: bool):
+    db = SessionLocal()
+    try:
+        drift = crud.rebuild_account_balances(db, fix=fix)
+    finally:
+        db.close()
+
+    if not drift:
+        print("Account balances are in sync with the ledger.")
+        return 0
+
+    for name, (stored, actual) in sorted(drift.items()):
+        print(f"{name}: stored={stored} actual={actual}")
+    if fix:
+        print(f"Rebuilt balances, {len(drift)} account(s) had drifted.")
+        return 0
+    print(f"{len(drift)} account(s) have drifted. Run rebuild-balances to fix.")
+    return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Financial tracker maintenance commands.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("verify-balances", help="Report drift in the stored account balances").set_defaults(func=verify_balances)
+    subparsers.add_parser("rebuild-balances", help="Recompute stored account balances from the ledger").set_defaults(func=rebuild_balances)
+    subparsers.add_parser("rebuild-monthly-totals", help="Recompute the monthly category totals from the ledger").set_defaults(func=rebuild_monthly_totals)
+    history_parser = subparsers.add_parser("rebuild-net-worth-history", help="Recompute the daily net worth history from the ledger")
+    history_parser.add_argument("--since", type=date.fromisoformat, help="Only rewrite the days from this date (YYYY-MM-DD) onward")
+    history_parser.set_defaults(func=rebuild_net_worth_history)
+    benchmark_parser = subparsers.add_parser("benchmark-analytics", help="Compare reporting query times through SQL and the analytics engine")
+    benchmark_parser.add_argument("--repeat", type=int, default=5, help="Runs per query; the fastest is reported")
+    benchmark_parser.set_defaults(func=benchmark_analytics)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
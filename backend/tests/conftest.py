@@ -0,0 +1,99 @@
+"""
+Shared fixtures. Every test that uses the db fixture runs once per database
+backend: SQLite always, and PostgreSQL when FINANCIAL_TRACKER_TEST_POSTGRESQL_URL
+points at a scratch database (e.g. a local or containerised server), whose
+tables are created and dropped around each test.
+"""
+import os
+
+# The app's own engine is never used by the tests
+os.environ.setdefault("FINANCIAL_TRACKER_DATABASE_URL", "sqlite://")
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from database import crud, models
+from database.cache import reference_data
+from database.session import SessionLocal, create_database_engine
+
+POSTGRESQL_URL = os.environ.get("FINANCIAL_TRACKER_TEST_POSTGRESQL_URL")
+
+ACCOUNTS = ["Bank Account", "Cash", "Touch and Go E-wallet"]
+CATEGORIES = [("Salary", "Income"), ("Food", "Expense"), ("Rent", "Expense"), ("Transport", "Expense"), ("Savings", "Transfer")]
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def engine(request, tmp_path):
+    if request.param == "postgresql":
+        if not POSTGRESQL_URL:
+            pytest.skip("FINANCIAL_TRACKER_TEST_POSTGRESQL_URL is not set")
+        url = POSTGRESQL_URL
+    else:
+        url = f"sqlite:///{tmp_path / 'test.db'}"
+    db_engine = create_database_engine(url)
+    models.Base.metadata.create_all(bind=db_engine)
+    yield db_engine
+    models.Base.metadata.drop_all(bind=db_engine)
+    db_engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    """
+    A session on the test database. crud's own sessions (e.g. the
+    reference_data loader) use the same database for the test's duration.
+    """
+    previous_bind = SessionLocal.kw["bind"]
+    SessionLocal.configure(bind=engine)
+    reference_data.invalidate()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        SessionLocal.configure(bind=previous_bind)
+        reference_data.invalidate()
+
+def seed_ledger(db, count: int, seed: int = 0, batch_size: int = 10000):
+    """
+    Inserts count random transactions spread over three years, plus the
+    accounts and categories they use, and rebuilds the derived tables.
+    Returns the inserted amounts in minor units.
+    """
+    crud.seed_reference_data(db, ACCOUNTS, CATEGORIES)
+    account_ids = [reference_data.id("accounts", name) for name in ACCOUNTS]
+    category_ids = {}
+    for name, type in CATEGORIES:
+        category_ids.setdefault(type, []).append(reference_data.id("categories", name))
+
+    rng = random.Random(seed)
+    start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    amounts = []
+    batch = []
+    for _ in range(count):
+        type = rng.choice(["Income", "Expense", "Expense", "Expense", "Transfer"])
+        from_account, to_account = rng.sample(account_ids, 2)
+        cents = rng.randint(1, 500_000)
+        amounts.append(cents)
+        batch.append({
+            "date": start + timedelta(minutes=rng.randint(0, 3 * 365 * 24 * 60)),
+            "type": type,
+            "amount": cents / models.MINOR_UNITS,
+            "category_id": rng.choice(category_ids[type]),
+            "description": f"Transaction {len(amounts)}",
+            "from_account_id": None if type == "Income" else from_account,
+            "to_account_id": None if type == "Expense" else to_account,
+        })
+        if len(batch) >= batch_size:
+            db.execute(insert(models.Transaction), batch)
+            batch.clear()
+    if batch:
+        db.execute(insert(models.Transaction), batch)
+    db.commit()
+
+    crud.rebuild_account_balances(db)
+    crud.rebuild_monthly_totals(db)
+    return amounts
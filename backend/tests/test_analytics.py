@@ -0,0 +1,58 @@
+"""
+The analytics engine answers like crud and keeps up with appended rows.
+"""
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import func, insert
+
+pytest.importorskip("numpy")
+
+from database import analytics, crud, models
+from database.cache import reference_data
+from tests.conftest import seed_ledger
+
+
+@pytest.fixture
+def engine_under_test():
+    analytics_engine = analytics.AnalyticsEngine(chunk_size=100)
+    yield analytics_engine
+    crud.transaction_write_listeners.remove(analytics_engine._transactions_written)
+
+
+def _insert_income(db, id: int, cents: int):
+    db.execute(insert(models.Transaction), {
+        "id": id,
+        "date": datetime(2024, 5, 1, tzinfo=timezone.utc),
+        "type": "Income",
+        "amount": cents / models.MINOR_UNITS,
+        "category_id": reference_data.id("categories", "Salary"),
+        "to_account_id": reference_data.id("accounts", "Cash"),
+    })
+    db.commit()
+    crud.rebuild_monthly_totals(db)
+    crud._transactions_changed(db, appended_only=True)
+
+
+def test_matches_crud(db, engine_under_test):
+    seed_ledger(db, 2000)
+    for group_by in (["type"], ["month", "category"], ["account", "type"]):
+        assert engine_under_test.get_summary(db, group_by) == crud.get_summary(db, group_by)
+    assert engine_under_test.get_budgets_status(db) == crud.get_budgets_status(db)
+
+
+def test_reloads_when_a_lower_id_commits_late(db, engine_under_test, monkeypatch):
+    # Make SQLite behave like PostgreSQL, where ids need not commit in order
+    monkeypatch.setattr(analytics, "IDS_IN_COMMIT_ORDER", ())
+    seed_ledger(db, 500)
+    last_id = db.query(func.max(models.Transaction.id)).scalar()
+    engine_under_test.get_summary(db, ["type"])
+
+    _insert_income(db, last_id + 2, 1234)
+    assert engine_under_test.get_summary(db, ["type"]) == crud.get_summary(db, ["type"])
+    assert (engine_under_test.loads, engine_under_test.appends) == (1, 1)
+
+    # The row that took id last_id + 1 first commits now
+    _insert_income(db, last_id + 1, 5678)
+    assert engine_under_test.get_summary(db, ["type"]) == crud.get_summary(db, ["type"])
+    assert (engine_under_test.loads, engine_under_test.appends) == (2, 2)
@@ -0,0 +1,70 @@
+"""
+The crud round trip on every backend in the matrix, plus engine setup for
+the database URLs the app accepts.
+"""
+import threading
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from app import schemas
+from database import crud
+from database.session import DB_MAX_OVERFLOW, DB_POOL_SIZE, create_database_engine, pool_args
+
+
+def test_in_memory_sqlite_shares_one_connection_across_threads():
+    assert pool_args("sqlite://") == {"poolclass": StaticPool}
+    db_engine = create_database_engine("sqlite://")
+    with db_engine.begin() as connection:
+        connection.execute(text("CREATE TABLE seen (value INTEGER)"))
+
+    def write():
+        with db_engine.begin() as connection:
+            connection.execute(text("INSERT INTO seen VALUES (1)"))
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    thread.join()
+    with db_engine.connect() as connection:
+        assert connection.execute(text("SELECT count(*) FROM seen")).scalar() == 1
+
+
+def test_file_sqlite_uses_the_configured_pool(tmp_path):
+    db_engine = create_database_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    assert isinstance(db_engine.pool, QueuePool)
+    assert db_engine.pool.size() == DB_POOL_SIZE
+    assert db_engine.pool._max_overflow == DB_MAX_OVERFLOW
+
+
+def test_crud_round_trip(db):
+    crud.seed_reference_data(db, ["Bank Account", "Cash"], [("Salary", "Income")])
+    crud.create_transaction(db, schemas.TransactionCreate(
+        type="Income", amount=1000.10, category="Salary", to_account="Bank Account",
+    ))
+    crud.create_transaction(db, schemas.TransactionCreate(
+        type="Expense", amount=12.35, category="Food", from_account="Bank Account",
+    ))
+    crud.create_transaction(db, schemas.TransactionCreate(
+        type="Transfer", amount=100, category="Savings", from_account="Bank Account", to_account="Cash",
+    ))
+
+    page = crud.get_transactions(db, limit=2)
+    assert page["total_count"] == 3
+    assert len(page["transactions"]) == 2
+    rest = crud.get_transactions(db, limit=2, cursor=page["next_cursor"])
+    assert [t.type for t in page["transactions"] + rest["transactions"]] == ["Transfer", "Expense", "Income"]
+
+    assert crud.get_account_balances(db) == {"Bank Account": 887.75, "Cash": 100.0}
+    assert crud.compute_account_balances(db) == crud.get_account_balances(db)
+
+    this_month = date.today().strftime("%Y-%m")
+    assert crud.get_summary_by_category(db, type="Expense") == {"Food": 12.35}
+    assert crud.get_summary_by_month(db, type="Income") == {this_month: 1000.1}
+    summary = crud.get_summary(db, ["month", "type"])
+    assert summary["columns"] == {
+        "month": [this_month] * 3,
+        "type": ["Expense", "Income", "Transfer"],
+        "total": [12.35, 1000.1, 100.0],
+        "count": [1, 1, 1],
+    }
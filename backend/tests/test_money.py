@@ -0,0 +1,64 @@
+"""
+Amounts are stored as integer minor units, so totals over many rows are
+exact. The row count defaults to a size that keeps the suite quick; set
+FINANCIAL_TRACKER_TEST_MONEY_ROWS=10000000 to check the totals at full
+scale, and run pytest with -s to see the aggregation timings.
+"""
+import os
+import time
+
+from sqlalchemy import Float, cast, func, select
+
+from app import schemas
+from database import crud, models
+from tests.conftest import ACCOUNTS, CATEGORIES, seed_ledger
+
+MONEY_ROWS = int(os.environ.get("FINANCIAL_TRACKER_TEST_MONEY_ROWS", "50000"))
+
+
+def test_totals_are_exact(db):
+    amounts = seed_ledger(db, MONEY_ROWS, seed=1)
+    exact_total = sum(amounts)
+
+    summary = crud.get_summary(db, ["type"])
+    cents_by_type = {
+        type: round(total * models.MINOR_UNITS)
+        for type, total in zip(summary["columns"]["type"], summary["columns"]["total"])
+    }
+    assert sum(summary["columns"]["count"]) == len(amounts)
+    assert sum(cents_by_type.values()) == exact_total
+    # Transfers cancel out, so the accounts together hold income minus expenses
+    balances = crud.compute_account_balances(db)
+    assert balances == crud.get_account_balances(db)
+    assert sum(round(balance * models.MINOR_UNITS) for balance in balances.values()) == (
+        cents_by_type["Income"] - cents_by_type["Expense"]
+    )
+
+    # SUM over the BIGINT column, against the float SUM the Float column used
+    started = time.perf_counter()
+    integer_total = db.execute(select(func.sum(models.Transaction.amount))).scalar()
+    integer_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    float_total = db.execute(
+        select(func.sum(cast(models.Transaction.amount, Float) / models.MINOR_UNITS))
+    ).scalar()
+    float_seconds = time.perf_counter() - started
+
+    assert integer_total == exact_total / models.MINOR_UNITS
+    print(
+        f"\n{len(amounts)} rows: integer SUM {integer_seconds * 1000:.1f} ms = {integer_total!r}, "
+        f"float SUM {float_seconds * 1000:.1f} ms = {float_total!r} "
+        f"(off by {abs(float_total - integer_total):.2e})"
+    )
+
+
+def test_amounts_that_cannot_be_stored_fail_validation_per_row(db):
+    crud.seed_reference_data(db, ACCOUNTS, CATEGORIES)
+    row = {"type": "Expense", "category": "Food", "from_account": "Cash"}
+    amounts = [12.5, float("nan"), float("inf"), float("-inf"), 1e300, -1e300, schemas.MAX_AMOUNT, 0.1]
+
+    result = crud.bulk_create_transactions(db, [{**row, "amount": amount} for amount in amounts])
+
+    assert result["inserted_count"] == 3
+    assert [error["row"] for error in result["errors"]] == [1, 2, 3, 4, 5]
+    assert crud.get_summary_by_category(db) == {"Food": 12.5 + schemas.MAX_AMOUNT + 0.1}
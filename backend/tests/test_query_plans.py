@@ -0,0 +1,100 @@
+"""
+Regression test for the transaction indexes: every statement a crud query
+sends to the transactions table is EXPLAINed on a seeded database and must
+be answered from an index rather than a full table scan.
+
+The row count defaults to a size that keeps the suite quick; set
+FINANCIAL_TRACKER_TEST_PLAN_ROWS=1000000 to check the plans at full scale.
+"""
+import os
+import re
+from datetime import date
+
+from sqlalchemy import event
+
+from app import schemas
+from database import crud, models
+from tests.conftest import seed_ledger
+
+PLAN_ROWS = int(os.environ.get("FINANCIAL_TRACKER_TEST_PLAN_ROWS", "20000"))
+
+TRANSACTIONS = models.Transaction.__tablename__
+
+
+def _queries():
+    """The crud reads that touch the transactions table, by name."""
+    def second_page(db):
+        first = crud.get_transactions(db, limit=20)
+        crud.get_transactions(db, limit=20, cursor=first["next_cursor"])
+
+    return {
+        "list": lambda db: crud.get_transactions(db, limit=20),
+        "list page by cursor": second_page,
+        "list by type": lambda db: crud.get_transactions(db, limit=20, type="Expense"),
+        "list by date range": lambda db: crud.get_transactions(db, start_date=date(2024, 3, 1), end_date=date(2024, 3, 31)),
+        "list by type and date range": lambda db: crud.get_transactions(
+            db, start_date=date(2024, 3, 1), end_date=date(2024, 3, 31), type="Income"
+        ),
+        "summary by category": lambda db: crud.get_summary_by_category(db, start_date=date(2024, 3, 15), end_date=date(2024, 6, 10)),
+        "summary by month": lambda db: crud.get_summary_by_month(db, start_date=date(2024, 3, 15), end_date=date(2024, 6, 10)),
+        "summary by day and category": lambda db: crud.get_summary(
+            db, ["day", "category"], start_date=date(2024, 3, 1), end_date=date(2024, 3, 31), types=["Expense"]
+        ),
+        "balances from the ledger": crud.compute_account_balances,
+        "budget status": crud.get_budgets_status,
+        "account in use": lambda db: crud._is_referenced(db, models.Account, 1),
+        "category in use": lambda db: crud._is_referenced(db, models.Category, 1),
+    }
+
+
+def _capture_statements(db, run):
+    """Runs run(db) and returns the (statement, parameters) it executed."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    db_engine = db.get_bind()
+    event.listen(db_engine, "before_cursor_execute", record)
+    try:
+        run(db)
+    finally:
+        event.remove(db_engine, "before_cursor_execute", record)
+    return [
+        (statement, parameters) for statement, parameters in statements
+        if re.search(rf"\b{TRANSACTIONS}\b", statement)
+    ]
+
+
+def _table_scans(connection, statement, parameters):
+    """Returns the plan lines that read the transactions table without an index."""
+    if connection.dialect.name == "sqlite":
+        plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+        details = [row[-1] for row in plan]
+        return [
+            detail for detail in details
+            if detail.startswith("SCAN") and TRANSACTIONS in detail and "USING" not in detail
+        ]
+    # On a small table PostgreSQL prefers a sequential scan even when an index
+    # fits, so rule those out and check that an index plan exists at all
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    plan = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).all()
+    details = [row[0] for row in plan]
+    return [detail for detail in details if f"Seq Scan on {TRANSACTIONS}" in detail]
+
+
+def test_crud_queries_use_transaction_indexes(db):
+    seed_ledger(db, PLAN_ROWS)
+    crud.create_or_update_budget(db, schemas.BudgetCreate(category_name="Food", amount=500))
+
+    scans = {}
+    for name, run in _queries().items():
+        statements = _capture_statements(db, run)
+        assert statements, f"{name} did not query {TRANSACTIONS}"
+        with db.get_bind().connect() as connection:
+            for statement, parameters in statements:
+                for detail in _table_scans(connection, statement, parameters):
+                    scans.setdefault(name, []).append(detail)
+            connection.rollback()
+    assert not scans, f"Queries scanning {TRANSACTIONS}: {scans}"